@@ -1,534 +1,449 @@
+import time
+
 import streamlit as st
 
+script_start = time.perf_counter()
 st.set_page_config(page_title="Student Skill Roadmap", layout="wide")
 
 if "page" not in st.session_state:
     st.session_state.page = "home"
 
 # ---------------- HOME PAGE ----------------
+# Only light modules here: pandas, scikit-learn and the dataset warm up in a background
+# thread (skill_roadmap.warmup) while the visitor reads this page.
 if st.session_state.page == "home":
+    from skill_roadmap.assets import HERO_IMAGE, pick_variant
+    from skill_roadmap.instrument import record_startup
+    from skill_roadmap.warmup import start_warmup
+
+    start_warmup()
     st.title("🎓 Student Skill Roadmap Dashboard")
 
-    st.image("vitaly-gariev-Sc2iIlwScic-unsplash.jpg", use_column_width=True)
+    # full width of the wide layout; phones get the smaller variant
+    mobile = "Mobi" in st.context.headers.get("User-Agent", "")
+    st.image(pick_variant(HERO_IMAGE, 1280 if mobile else 1920, build=False), width="stretch")
 
     if st.button("Start Your Roadmap"):
         st.session_state.page = "roadmap"
         st.rerun()
+    record_startup("first_render_home", (time.perf_counter() - script_start) * 1000)
 
 # ---------------- ROADMAP PAGE ----------------
 elif st.session_state.page == "roadmap":
-    import pandas as pd
-    from datetime import date
+    import functools
+    import io
+    import os
+    import uuid
+    from contextlib import nullcontext
+    from skill_roadmap.instrument import (
+        TRACE_FILE,
+        begin_run,
+        count_call,
+        count_miss,
+        end_run,
+        record_startup,
+        snapshot,
+        span,
+        startup_phase,
+        trace_run,
+    )
+    from skill_roadmap.warmup import WARMED, wait_for_warmup
+    
+    # the first time in a process this is the real import cost (less whatever the warm-up already did)
+    with startup_phase("import_roadmap_modules"):
+        from skill_roadmap import (
+            JOB_SKILL_ANALYSIS,
+            ROADMAP_CACHE,
+            SKILL_CATALOG,
+            DatasetStore,
+            attach_dataset,
+            build_backoff_index,
+            build_knn_index,
+            build_risk_index,
+            compute_skill_gap,
+            dataset_version,
+            load_risk_model,
+            rank_roles,
+        )
+        from skill_roadmap.analytics import HISTOGRAM_BINS, aggregate_cells, build_cube, crosstab, histogram, summary
+        from skill_roadmap.explorer import FILTER_COLUMNS, PAGE_SIZES, column_values, filter_positions, query_page
+        from skill_roadmap.export import EXPORT_FORMATS, csv_chunks, dataset_chunks, iter_roadmaps, write_zip
+        from skill_roadmap.ingest import data_mode, stream_dataset
     
     # ---------------- Page Config ----------------
     st.set_page_config(page_title="Student Skill Roadmap", layout="centered")
     
-    # ---------------- Load Dataset ----------------
-    @st.cache_data
-    def load_data():
-        return pd.read_csv("student_performance_extended.csv")  # Replace with your dataset path
-    
-    data = load_data()
-    
-    # ---------------- Helpers ----------------
-    def safe_unique(df, col, fallback):
-        return sorted(df[col].dropna().unique()) if col in df.columns else fallback
-    
-    def normalize_yes_no(x):
-        if isinstance(x, str):
-            x = x.strip().lower()
-            if x in ("yes", "y", "true", "1"):
-                return "Yes"
-        return "No"
-    
-    def get_similar_students(df, info):
-        """Simple similarity filter (no ML): same year + branch + interest + skill_level if possible."""
-        f = df.copy()
-        if "hostel" in f.columns:
-            f["hostel"] = f["hostel"].apply(normalize_yes_no)
-        for k, col in [("year", "year"), ("branch", "branch"), ("interest", "interest"), ("skill_level", "skill_level")]:
-            if col in f.columns and k in info and info[k] is not None:
-                f = f[f[col] == info[k]]
-        return f
-    
-    def build_week_plan(interest, skill_level, budget_level):
-        """A structured 4-week roadmap (generic but clean)."""
-        free_note = "Use free resources (YouTube/NPTEL/free Coursera audits)." if budget_level=="Low" else "Consider 1 paid course + mentorship for speed."
-        if skill_level=="Beginner":
-            project = "Mini project: build a basic end-to-end demo"
-            depth = "Focus on fundamentals + consistent practice"
-        else:
-            project = "Project: build a portfolio-grade real-world application"
-            depth = "Focus on advanced concepts + real datasets + deployment"
-        return [
-            {"title":"Week 1 — Foundation","bullets":[f"{depth} in **{interest}** (core concepts).","Set up tools (GitHub, editor, notes).","Daily practice: 45–60 mins.", free_note]},
-            {"title":"Week 2 — Skill Building","bullets":["Solve 10–15 practice problems / exercises.","Start a structured course + take notes.","Build 1 small component (feature/module) daily."]},
-            {"title":"Week 3 — Projects & Proof","bullets":[project,"Add README + screenshots + clear steps.","Push code daily to GitHub (commit streak)."]},
-            {"title":"Week 4 — Career Readiness","bullets":["Resume: add project + skills + links.","Mock interview / presentations (2 sessions).","Polish project + deploy (if possible).","Plan next month based on gaps."]},
-        ]
-    
-    def generate_structured_roadmap(info, df):
-        """Return a rich roadmap object (not just flat strings)."""
-        steps, risks, habits, goals = [], [], [], []
-        sim = get_similar_students(df, info)
-        sim_note = None
-        if len(sim) >= 5:
-            avg_gpa = sim["gpa"].mean() if "gpa" in sim.columns else None
-            avg_study = sim["study_hours"].mean() if "study_hours" in sim.columns else None
-            if avg_gpa is not None and avg_study is not None:
-                sim_note = f"Based on **{len(sim)} similar students** (same year/branch/interest/skill), average GPA is **{avg_gpa:.2f}** and average study hours is **{avg_study:.1f}/day**."
+    # ---------------- Instrumentation (opt-in) ----------------
+    # Enabled with ROADMAP_DEBUG=1 or ?debug=1; when off every span is a no-op.
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    debug = os.environ.get("ROADMAP_DEBUG") == "1" or st.query_params.get("debug") == "1"
+    timing = debug and st.sidebar.toggle("⏱ Timing panel", key="timing_panel")
+    run = begin_run(st.session_state.session_id) if timing else None
+    # end_run sits in finally: st.rerun() (the Back button) and errors leave the page early
+    try:
+        def timed_section(label):
+            """Time a section; as a fragment rerun it is traced as its own run."""
+            def wrap(fn):
+                @functools.wraps(fn)
+                def inner(*args, **kwargs):
+                    with trace_run(st.session_state.session_id, label) if timing else nullcontext():
+                        return fn(*args, **kwargs)
+                return inner
+            return wrap
+        
+        # ---------------- Load Dataset ----------------
+        # Cached per dataset version, so everything below is rebuilt only when the CSV changes.
+        # Rows appended to the CSV are folded in incrementally by the process-wide DatasetStore
+        # (only the new tail is parsed, merged into the percentile arrays and risk-scored);
+        # the bumped version then invalidates the roadmap caches.
+        # Big files (or ROADMAP_INGEST=stream) are never held whole: one streaming pass keeps the
+        # cohort aggregates, category dictionaries and a reservoir sample for the preview.
+        # With several server processes, ROADMAP_DATA_MODE=shared has one of them publish the dataset,
+        # cohort index and percentile arrays once; every process maps the same read-only files.
+        MODE = data_mode()
+        STREAMING, SHARED = MODE == "stream", MODE == "shared"
+        
+        @st.cache_resource
+        def dataset_store():
+            count_miss("dataset_store")
+            wait_for_warmup()  # adopt the store the home page's warm-up loaded, if any
+            return WARMED.get("dataset_store") or DatasetStore()
+        
+        @st.cache_resource(max_entries=1)
+        def load_streamed(version):
+            count_miss("load_streamed")
+            summary = stream_dataset()
+            return summary["sample"], summary["options"], summary["index"], summary["percentiles"], summary["cube_cells"]
+        
+        @st.cache_resource(max_entries=1)
+        def load_shared(version):
+            count_miss("load_shared")
+            wait_for_warmup()  # the warm-up may be publishing this version right now
+            return attach_dataset()
+        
+        cube_cells = risk = None
+        with span("load_data"):
+            if STREAMING:
+                version = dataset_version()
+                count_call("load_streamed")
+                data, options, cohort_index, percentiles, cube_cells = load_streamed(version)
+            elif SHARED:
+                count_call("load_shared")
+                current = load_shared(dataset_version())
+                data, options, cohort_index, backoff, percentiles, version = (
+                    current[k] for k in ("df", "options", "index", "backoff", "percentiles", "version"))
             else:
-                sim_note = f"Not enough similar-student rows for strong stats (found {len(sim)}). Using rule-based roadmap."
-        else:
-            sim_note = f"Not enough similar-student rows for strong stats (found {len(sim)}). Using rule-based roadmap."
-    
-        # Core goals
-        goals.append(f"Build a clear learning path in **{info['interest']}**.")
-        if info["gpa"] < 6.0: goals.append("Improve academic consistency (target +0.5 GPA next semester).")
-        if info["study_hours"] < 3: goals.append("Increase study hours gradually to a sustainable level.")
-        if info["communication"] in ("Poor","Low"): goals.append("Improve communication through weekly speaking/writing practice.")
-    
-        # Risks & Habits
-        if info["stress_level"]=="High" or info["confusion_level"]=="High":
-            risks.append("High stress/confusion can reduce consistency → use weekly planning + short focused sessions.")
-            habits.append("10 min breathing/meditation + 25/5 Pomodoro (2 cycles).")
-        if info["hostel"]=="Yes":
-            habits.append("Hostel routine: fixed sleep + fixed study slot + limit late-night scrolling.")
-        else:
-            habits.append("Home routine: fixed study slot + communicate study time to family.")
-        if info["family_support"]=="Low":
-            steps.append("Get external support: mentor/teacher/peer group + online communities.")
-        else:
-            steps.append("Use family support: share weekly goals and ask for accountability.")
-        if info["budget"]=="Low":
-            steps.append("Use free resources first + build projects (proof > certificates).")
-        else:
-            steps.append("Pick 1 high-quality paid course OR mentorship for faster progress.")
-        if info["study_hours"]<3:
-            steps.append("Study plan: add +30 mins/week until you reach 3–4 hours/day.")
-        if info["gpa"]<6.0:
-            steps.append("Academics: revise daily + weekly tests + focus on weak subjects.")
-        if info["communication"] in ("Poor","Low"):
-            steps.append("Communication: 2 short talks/week + write 1 summary/day (5–7 lines).")
-    
-        week_plan = build_week_plan(info["interest"], info["skill_level"], info["budget"])
-    
-        # Resources by interest
-        interest_lower = str(info["interest"]).lower()
-        if "data" in interest_lower or "ml" in interest_lower or "ai" in interest_lower:
-            resources = ["NPTEL / YouTube: Python + ML basics","Kaggle: datasets + notebooks","GitHub: portfolio + README","LeetCode/HackerRank: fundamentals (optional)"]
-            projects = ["Student performance prediction / analysis dashboard","Mini recommender system","Simple ML model + Streamlit deployment"]
-        elif "web" in interest_lower:
-            resources = ["MDN Web Docs (HTML/CSS/JS)","Frontend practice: small clones","GitHub Pages / Vercel for deployment"]
-            projects = ["Portfolio website","To-do app + local storage","Mini full-stack CRUD app"]
-        else:
-            resources = ["YouTube + NPTEL fundamentals","One structured course (beginner → intermediate)","Build 2–3 projects + document well"]
-            projects = ["1 mini project","1 intermediate project","1 portfolio-grade project"]
-    
-        return {"similar_note": sim_note,"goals": goals,"risks": risks,"habits": habits,"steps": steps,"week_plan": week_plan,"resources": resources,"projects": projects}
-    
-    JOB_SKILL_ANALYSIS = {
-        "Software Developer": {
-            "skills": [
-                "Python / Java",
-                "Data Structures & Algorithms",
-                "HTML, CSS, JavaScript",
-                "Git & GitHub",
-                "Databases (SQL)",
-                "OOPS",
-                "Problem Solving"
-            ],
-            "projects": [
-                "Student Management System",
-                "Task Tracker Application",
-                "Portfolio Website",
-                "REST API Mini Project"
-            ],
-            "resources": [
-                "NPTEL – Programming & DSA",
-                "YouTube – freeCodeCamp",
-                "GeeksForGeeks – DSA",
-                "GitHub – Open Source Projects"
-            ]
-        },
-        "Frontend Developer": {
-            "skills": [
-                "HTML",
-                "CSS",
-                "JavaScript",
-                "React",
-                "Responsive Design",
-                "Git & GitHub"
-            ],
-            "projects": [
-                "Portfolio Website",
-                "React To-Do App",
-                "UI Clone (Netflix / Amazon)"
-            ],
-            "resources": [
-                "MDN Web Docs",
-                "Traversy Media (YouTube)",
-                "React Official Docs"
-            ]
-        },
-        "Backend Developer": {
-            "skills": [
-                "Node.js / Python / Java",
-                "Databases (SQL/NoSQL)",
-                "APIs / RESTful Services",
-                "Git & GitHub",
-                "Authentication & Security"
-            ],
-            "projects": [
-                "REST API Project",
-                "E-commerce Backend",
-                "Blog Platform Backend"
-            ],
-            "resources": [
-                "Udemy Backend Courses",
-                "YouTube - Tech With Tim / Traversy Media",
-                "MongoDB University"
-            ]
-        },
-        "Data Scientist": {
-            "skills": [
-                "Python",
-                "Statistics",
-                "Pandas & NumPy",
-                "Data Visualization",
-                "Machine Learning Basics"
-            ],
-            "projects": [
-                "Student Performance Analysis",
-                "Sales Prediction Model",
-                "EDA Project"
-            ],
-            "resources": [
-                "Kaggle Learn",
-                "Krish Naik (YouTube)",
-                "Coursera ML (Audit Mode)"
-            ]
-        },
-        "Machine Learning Engineer": {
-            "skills": [
-                "Python",
-                "Linear Algebra & Statistics",
-                "Scikit-learn / TensorFlow / PyTorch",
-                "Data Preprocessing",
-                "Model Deployment"
-            ],
-            "projects": [
-                "Predictive Analytics Model",
-                "Image Classification Project",
-                "Recommendation System"
-            ],
-            "resources": [
-                "Fast.ai Courses",
-                "DeepLearning.ai (Coursera)",
-                "YouTube - Sentdex / Krish Naik"
-            ]
-        },
-        "DevOps Engineer": {
-            "skills": [
-                "Linux / Shell Scripting",
-                "CI/CD (Jenkins/GitHub Actions)",
-                "Docker / Kubernetes",
-                "Cloud Platforms (AWS / GCP / Azure)",
-                "Monitoring & Logging"
-            ],
-            "projects": [
-                "CI/CD Pipeline Setup",
-                "Dockerized Application Deployment",
-                "Cloud Infrastructure Project"
-            ],
-            "resources": [
-                "Linux Academy / A Cloud Guru",
-                "YouTube - TechWorld with Nana",
-                "Official Docker & Kubernetes Docs"
-            ]
-        },
-        "UI/UX Designer": {
-            "skills": [
-                "Figma / Adobe XD",
-                "Wireframing & Prototyping",
-                "User Research & Testing",
-                "Responsive Design Principles",
-                "Portfolio Creation"
-            ],
-            "projects": [
-                "Mobile App Wireframes",
-                "Website Redesign Project",
-                "Interactive Prototype"
-            ],
-            "resources": [
-                "Figma Learn Tutorials",
-                "Coursera UI/UX Courses",
-                "YouTube - DesignCourse / CharliMarieTV"
-            ]
-        },
-        "Cybersecurity Analyst": {
-            "skills": [
-                "Networking Basics",
-                "Linux & Windows Security",
-                "Penetration Testing",
-                "Firewalls & IDS/IPS",
-                "Security Tools (Wireshark, Nmap)"
-            ],
-            "projects": [
-                "Vulnerability Assessment",
-                "Phishing Simulation",
-                "Secure Web Application Setup"
-            ],
-            "resources": [
-                "TryHackMe / Hack The Box",
-                "Cybrary Courses",
-                "YouTube - NetworkChuck / The Cyber Mentor"
-            ]
-        },
-        "Mobile App Developer": {
-            "skills": [
-                "Java / Kotlin / Swift / Flutter",
-                "UI/UX for Mobile",
-                "APIs & Backend Integration",
-                "App Deployment (Play Store / App Store)",
-                "Debugging & Testing"
-            ],
-            "projects": [
-                "Todo App",
-                "Weather Forecast App",
-                "E-commerce Mobile App"
-            ],
-            "resources": [
-                "Udemy Mobile App Courses",
-                "YouTube - CodeWithChris / The Net Ninja",
-                "Official Flutter Docs"
-            ]
-        },
-        "Cloud Engineer": {
-            "skills": [
-                "AWS / Azure / GCP",
-                "Cloud Architecture & Design",
-                "Networking & Security",
-                "CI/CD Pipelines",
-                "Infrastructure as Code (Terraform)"
-            ],
-            "projects": [
-                "Deploy Web App on Cloud",
-                "Serverless Application Project",
-                "Cloud Monitoring Setup"
-            ],
-            "resources": [
-                "AWS / Azure / GCP Official Docs",
-                "A Cloud Guru Courses",
-                "YouTube - TechWorld with Nana"
-            ]
-        },
-        "Business Analyst": {
-            "skills": [
-                "Excel / SQL / Tableau / PowerBI",
-                "Requirement Gathering",
-                "Process Modeling",
-                "Data Analysis & Reporting",
-                "Communication & Presentation"
-            ],
-            "projects": [
-                "Sales Dashboard",
-                "Customer Analysis Report",
-                "Process Optimization Project"
-            ],
-            "resources": [
-                "Coursera Business Analytics",
-                "Udemy SQL / Tableau Courses",
-                "YouTube - Analytics University"
-            ]
-        },
-        "Digital Marketing Specialist": {
-            "skills": [
-                "SEO / SEM",
-                "Google Analytics",
-                "Content Creation",
-                "Social Media Marketing",
-                "Email Marketing"
-            ],
-            "projects": [
-                "SEO Campaign Project",
-                "Social Media Ad Campaign",
-                "Email Marketing Automation"
-            ],
-            "resources": [
-                "Google Digital Garage",
-                "HubSpot Academy",
-                "YouTube - Neil Patel / Brian Dean"
-            ]
-        },
-        "Blockchain Developer": {
-            "skills": [
-                "Solidity / Ethereum",
-                "Smart Contracts",
-                "Web3.js / Ethers.js",
-                "Blockchain Architecture",
-                "Cryptography Basics"
-            ],
-            "projects": [
-                "Smart Contract Deployment",
-                "NFT Minting Platform",
-                "Decentralized App (DApp)"
-            ],
-            "resources": [
-                "CryptoZombies.io",
-                "Coursera Blockchain Courses",
-                "YouTube - Dapp University"
-            ]
-        },
-        "AI Researcher": {
-            "skills": [
-                "Python / R",
-                "Mathematics (Linear Algebra, Probability)",
-                "Deep Learning",
-                "NLP / Computer Vision",
-                "Research Paper Reading & Implementation"
-            ],
-            "projects": [
-                "Image Captioning Model",
-                "Text Summarization Model",
-                "Custom Neural Network Research"
-            ],
-            "resources": [
-                "arXiv Papers",
-                "DeepLearning.ai",
-                "YouTube - Yannic Kilcher / Two Minute Papers"
-            ]
-        }
-    }
-    
-    
-    def compute_skill_gap(required_skills, known_skills):
-        known = [s for s in required_skills if s in known_skills]
-        missing = [s for s in required_skills if s not in known_skills]
-        return known, missing
-    
-    # ---------------- Markdown Export ----------------
-    def roadmap_to_markdown(name, info, roadmap):
-        def s(x): return str(x) if x is not None else ""
-        lines = [
-            f"# Personalized Roadmap for {s(name)}",
-            f"**Generated on:** {date.today()}",
-            ""
-        ]
-        lines.append("## Profile")
-        for k in ["year","branch","interest","skill_level","budget","hostel","study_hours",
-                  "gpa","stress_level","confusion_level","communication","family_support"]:
-            lines.append(f"- **{k.replace('_',' ').title()}**: {s(info.get(k))}")
-        lines.append("")
-        lines.append("## Data Insight")
-        lines.append(s(roadmap.get("similar_note","")))
-        lines.append("")
-        lines.append("## Goals")
-        for g in roadmap.get("goals", []): lines.append(f"- {s(g)}")
-        lines.append("")
-        for section, items in [("Risks to Watch", roadmap.get("risks",[])),
-                               ("Daily Habits", roadmap.get("habits",[])),
-                               ("Action Steps", roadmap.get("steps",[])),
-                               ("Suggested Projects", roadmap.get("projects",[])),
-                               ("Resources", roadmap.get("resources",[]))]:
-            if items:
-                lines.append(f"## {section}")
-                for i in items: lines.append(f"- {s(i)}")
-                lines.append("")
-        # 4-Week plan
-        lines.append("## 4-Week Plan")
-        for w in roadmap.get("week_plan", []):
-            lines.append(f"### {s(w.get('title',''))}")
-            for b in w.get("bullets", []):
-                lines.append(f"- {s(b)}")
-            lines.append("")
-        return "\n".join(lines)
-    
-    # ---------------- UI ----------------
-    st.title("🎓 Personalized Student Skill Roadmap")
-    st.caption("A cleaner roadmap output with week-wise plan + data-driven insights.")
-    st.divider()
-    
-    # -------- User Input --------
-    
-    st.header("📋 Enter Your Details")
-    name = st.text_input("Student Name", "")
-    year = st.selectbox("Year", years)
-    branch = st.selectbox("Branch", branches)
-    gpa = st.slider("GPA", 0.0, 10.0, 7.0, 0.1)
-    study_hours = st.slider("Daily Study Hours", 0, 12, 3)
-    backlogs = st.number_input("Number of Backlogs", min_value=0, max_value=10, value=0)
-    hostel = st.selectbox("Hostel?", ["Yes","No"])
-    sleep_hours = st.slider("Daily Sleep Hours", 0,12,6)
-    family_support = st.selectbox("Family Support Level", ["Low","Medium","High"])
-    interest = st.selectbox("Primary Interest", interests)
-    budget = st.selectbox("Budget Level", budgets)
-    skill_level = st.selectbox("Skill Level", skill_levels)
-    stress_level = st.selectbox("Stress Level", stress_levels)
-    confusion_level = st.selectbox("Confusion Level", conf_levels)
-    communication = st.selectbox("Communication Level", comm_levels)
-    st.divider()
- 
-    # ---------------- Skill Analysis Section (Standalone) ----------------
-    st.divider()
-    st.header("🧩 Skill Analysis (Optional / Standalone)")
-    
-    # User selects a job role first
-    job_choice = st.selectbox("Choose a Job Role", ["Select a role"] + list(JOB_SKILL_ANALYSIS.keys()), key="skill_analysis_role")
-    
-    if job_choice != "Select a role":
-        job_info = JOB_SKILL_ANALYSIS[job_choice]
-    
-        st.subheader("🧠 Required Skills")
-        st.write(", ".join(job_info["skills"]))
-    
-        st.subheader("🧪 Sample Projects")
-        for p in job_info["projects"]:
-            st.write(f"• {p}")
-    
-        st.subheader("📚 Recommended Resources")
-        for r in job_info["resources"]:
-            st.write(f"• {r}")
-    
-        st.subheader("🎓 Your Current Skills")
-        known_skills = st.multiselect("Select skills you already know", job_info["skills"], key="skill_analysis_known")
-    
-        # Only show skill gap analysis if user selects known skills
-        if known_skills:
-            known, missing = compute_skill_gap(job_info["skills"], known_skills)
-    
-            st.subheader("📊 Skill Gap Analysis")
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("### ✅ Skills You Have")
-                for s in known:
-                    st.success(s)
-    
-            with col2:
-                st.markdown("### ❌ Skills You Need to Learn")
-                for s in missing:
-                    st.error(s)
-    
-            if missing:
-                st.subheader("🛣️ Recommended Learning Order")
-                for i, s in enumerate(missing, 1):
-                    st.write(f"{i}. Learn **{s}**")
-    
-    
-    
-    # ---------------- Dataset Preview ----------------
-    st.divider()
-    with st.expander("📊 Sample Student Dataset (Preview)", expanded=False):
-        st.dataframe(data, use_container_width=True)
-    st.caption("Mini Project | Student Skill Roadmap | Streamlit Web App")
-    if st.button("⬅ Back to Dashboard"):
-        st.session_state.page = "home"
-        st.rerun()
-
-
-
-
-
-
-
-
+                count_call("dataset_store")
+                current = dataset_store().refresh()
+                data, options, cohort_index, backoff, percentiles, risk, cube_cells, version = (
+                    current[k] for k in ("df", "options", "index", "backoff", "percentiles", "risk", "cube_cells",
+                                         "version"))
+        
+        @st.cache_resource(max_entries=1)
+        def load_backoff(version, _index):
+            # streamed indexes have no rows, so this is aggregates only; the other modes bring theirs
+            count_miss("load_backoff")
+            return build_backoff_index(_index)
+        
+        if STREAMING:
+            count_call("load_backoff")
+            backoff = load_backoff(version, cohort_index)
+        
+        @st.cache_resource(max_entries=1)
+        def load_risk(version, _df):
+            # artifact read once per process (risk.load_risk_model); dataset scored once per version
+            count_miss("load_risk")
+            artifact = load_risk_model()
+            return build_risk_index(artifact, _df) if artifact is not None else None
+        
+        if STREAMING or SHARED:
+            count_call("load_risk")
+            risk = load_risk(version, data)
+        
+        @st.cache_resource(max_entries=1)
+        def load_cube(version, _df, _cells=None):
+            # streamed datasets bring their cells from the ingest pass (the sample would skew the counts),
+            # and the DatasetStore merges an append's cells into its snapshot's; only shared mode aggregates here
+            count_miss("load_cube")
+            return build_cube(_cells if _cells is not None else aggregate_cells(_df))
+        
+        @st.cache_resource(max_entries=1)
+        def load_knn_index(version, _df):
+            count_miss("load_knn_index")
+            return build_knn_index(_df)
+        
+        def render_roadmap(roadmap):
+            st.header("🗺️ Your Roadmap")
+            st.info(roadmap["similar_note"])
+            if roadmap.get("standing_notes"):
+                st.subheader("📊 Where You Stand")
+                for line in roadmap["standing_notes"]:
+                    st.markdown(f"- {line}")
+            for title, key in [("🎯 Goals", "goals"), ("⚠️ Risks to Watch", "risks"), ("🔁 Daily Habits", "habits"),
+                               ("✅ Action Steps", "steps"), ("🧪 Suggested Projects", "projects"), ("📚 Resources", "resources")]:
+                if roadmap[key]:
+                    st.subheader(title)
+                    for item in roadmap[key]:
+                        st.markdown(f"- {item}")
+            st.subheader("📅 4-Week Plan")
+            for week in roadmap["week_plan"]:
+                with st.expander(week["title"]):
+                    for b in week["bullets"]:
+                        st.markdown(f"- {b}")
+        
+        # ---------------- UI ----------------
+        st.title("🎓 Personalized Student Skill Roadmap")
+        st.caption("A cleaner roadmap output with week-wise plan + data-driven insights.")
+        st.divider()
+        
+        # -------- User Input --------
+        # All profile widgets live in one form: nothing reruns until "Generate" is pressed.
+        st.header("📋 Enter Your Details")
+        with st.form("profile_form"):
+            name = st.text_input("Student Name", "")
+            year = st.selectbox("Year", options["years"])
+            branch = st.selectbox("Branch", options["branches"])
+            gpa = st.slider("GPA", 0.0, 10.0, 7.0, 0.1)
+            study_hours = st.slider("Daily Study Hours", 0, 12, 3)
+            backlogs = st.number_input("Number of Backlogs", min_value=0, max_value=10, value=0)
+            hostel = st.selectbox("Hostel?", ["Yes","No"])
+            sleep_hours = st.slider("Daily Sleep Hours", 0,12,6)
+            family_support = st.selectbox("Family Support Level", ["Low","Medium","High"])
+            interest = st.selectbox("Primary Interest", options["interests"])
+            budget = st.selectbox("Budget Level", options["budgets"])
+            skill_level = st.selectbox("Skill Level", options["skill_levels"])
+            stress_level = st.selectbox("Stress Level", options["stress_levels"])
+            confusion_level = st.selectbox("Confusion Level", options["conf_levels"])
+            communication = st.selectbox("Communication Level", options["comm_levels"])
+            similarity = st.radio("Compare me with", ["Same cohort", "Most similar students"], horizontal=True)
+            submitted = st.form_submit_button("🚀 Generate My Roadmap")
+        
+        if submitted:
+            st.session_state.profile = {
+                "name": name or "Student",
+                "similarity": "knn" if similarity == "Most similar students" else "exact",
+                "info": {"year": year, "branch": branch, "interest": interest, "skill_level": skill_level,
+                         "budget": budget, "hostel": hostel, "study_hours": study_hours, "gpa": gpa,
+                         "sleep_hours": sleep_hours, "failures": backlogs, "stress_level": stress_level,
+                         "confusion_level": confusion_level, "communication": communication,
+                         "family_support": family_support},
+            }
+        
+        profile = st.session_state.get("profile")
+        if profile:
+            info = profile["info"]
+            with span("roadmap"):
+                if profile["similarity"] == "knn":
+                    count_call("load_knn_index")
+                    kwargs = {"similarity": "knn", "knn": load_knn_index(version, data)}
+                else:
+                    kwargs = {"similarity": "exact", "index": cohort_index, "backoff": backoff}
+                kwargs.update(percentiles=percentiles, risk=risk)
+                roadmap = ROADMAP_CACHE.roadmap(info, data, version, **kwargs)
+                render_roadmap(roadmap)
+            with span("markdown_export"):
+                markdown = ROADMAP_CACHE.roadmap_markdown(profile["name"], info, data, version, **kwargs)
+            st.download_button(
+                "⬇ Download Roadmap (Markdown)",
+                markdown,
+                file_name=f"roadmap_{profile['name'].strip().replace(' ', '_').lower()}.md",
+                mime="text/markdown",
+            )
+        st.divider()
+     
+        # ---------------- Skill Analysis Section (Standalone) ----------------
+        # Fragments rerun on their own: changing a role or a known skill never re-executes the page.
+        @st.fragment
+        @timed_section("skill_analysis")
+        def skill_analysis_section():
+            st.header("🧩 Skill Analysis (Optional / Standalone)")
+        
+            # User selects a job role first
+            job_choice = st.selectbox("Choose a Job Role", ["Select a role"] + list(JOB_SKILL_ANALYSIS.keys()), key="skill_analysis_role")
+        
+            if job_choice != "Select a role":
+                job_info = JOB_SKILL_ANALYSIS[job_choice]
+        
+                st.subheader("🧠 Required Skills")
+                st.write(", ".join(job_info["skills"]))
+        
+                st.subheader("🧪 Sample Projects")
+                for p in job_info["projects"]:
+                    st.write(f"• {p}")
+        
+                st.subheader("📚 Recommended Resources")
+                for r in job_info["resources"]:
+                    st.write(f"• {r}")
+        
+                st.subheader("🎓 Your Current Skills")
+                known_skills = st.multiselect("Select skills you already know", job_info["skills"], key="skill_analysis_known")
+        
+                # Only show skill gap analysis if user selects known skills
+                if known_skills:
+                    known, missing = compute_skill_gap(job_info["skills"], known_skills)
+        
+                    st.subheader("📊 Skill Gap Analysis")
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.markdown("### ✅ Skills You Have")
+                        for s in known:
+                            st.success(s)
+        
+                    with col2:
+                        st.markdown("### ❌ Skills You Need to Learn")
+                        for s in missing:
+                            st.error(s)
+        
+                    if missing:
+                        st.subheader("🛣️ Recommended Learning Order")
+                        for i, s in enumerate(missing, 1):
+                            st.write(f"{i}. Learn **{s}**")
+        
+            # Rank every role at once against the skills the student already has
+            st.subheader("🏆 Best-Fit Roles")
+            all_known = st.multiselect("Select all skills you know (across roles)", SKILL_CATALOG["vocab"], key="skill_analysis_all_known")
+            if all_known:
+                ranking = rank_roles(all_known, top=5)
+                st.dataframe(
+                    [{"Role": r["role"], "Coverage": f"{r['coverage']:.0%}", "Have": f"{r['matched']}/{r['required']}",
+                      "Missing": ", ".join(r["missing"])} for r in ranking],
+                    width="stretch", hide_index=True,
+                )
+        
+        skill_analysis_section()
+        
+        # ---------------- Dataset Preview ----------------
+        # Only the visible page is sent to the browser; filtering/sorting happens server-side.
+        @st.fragment
+        @timed_section("dataset_preview")
+        def dataset_preview(df):
+            with st.expander("📊 Sample Student Dataset (Preview)", expanded=False):
+                cols = st.columns(len(FILTER_COLUMNS))
+                filters = {}
+                for c, col in zip(cols, FILTER_COLUMNS):
+                    if col in df.columns:
+                        with c:
+                            filters[col] = st.multiselect(col.replace("_", " ").title(), column_values(df, col),
+                                                          key=f"explorer_{col}")
+                shown = st.multiselect("Columns", list(df.columns), default=list(df.columns), key="explorer_columns")
+                c1, c2, c3, c4 = st.columns([3, 2, 2, 2])
+                with c1:
+                    sort_by = st.selectbox("Sort by", ["(none)"] + list(df.columns), key="explorer_sort")
+                with c2:
+                    ascending = st.radio("Order", ["Asc", "Desc"], horizontal=True, key="explorer_order") == "Asc"
+                with c3:
+                    page_size = st.selectbox("Rows per page", PAGE_SIZES, key="explorer_page_size")
+                with c4:
+                    page = st.number_input("Page", min_value=1, value=1, step=1, key="explorer_page")
+                frame, total, page_count = query_page(df, filters, shown, None if sort_by == "(none)" else sort_by,
+                                                      ascending, int(page), page_size)
+                st.dataframe(frame, width="stretch")
+                page = min(int(page), page_count)
+                st.caption(f"Page {page} of {page_count} · {total:,} matching rows of {len(df):,}"
+                           + (" (random sample of a streamed dataset)" if STREAMING else ""))
+        
+        # ---------------- Analytics ----------------
+        # Charts read the cube's pre-binned rollups (cached per dataset version), never the raw rows.
+        def column_label(col):
+            return col.replace("_", " ").title() if col else "(none)"
+        
+        @st.fragment
+        @timed_section("analytics")
+        def analytics_section():
+            count_call("load_cube")
+            cube = load_cube(version, data, cube_cells)
+            with st.expander("📈 Dataset Analytics", expanded=False):
+                dims = cube["dimensions"]
+                c1, c2, c3 = st.columns(3)
+                with c1:
+                    by = st.selectbox("Group by", dims, format_func=column_label, key="analytics_by")
+                with c2:
+                    split = st.selectbox("Split by", [None] + [d for d in dims if d != by], format_func=column_label,
+                                         key="analytics_split")
+                with c3:
+                    measure = st.selectbox("Distribution of", [m for m in HISTOGRAM_BINS if m in cube["measures"]],
+                                           format_func=column_label, key="analytics_measure")
+                st.dataframe(summary(cube, (by, split) if split else (by,)), width="stretch", hide_index=True)
+                # sort=False keeps the bins in numeric order ("2–3" before "10–11")
+                st.bar_chart(histogram(cube, measure, by), x_label=column_label(measure), y_label="Students",
+                             sort=False)
+                if split:
+                    st.bar_chart(crosstab(cube, by, split), x_label=column_label(by), y_label="Students")
+                st.caption(f"Pre-aggregated over {cube['rows']:,} rows")
+        
+        # ---------------- Bulk Export ----------------
+        # Roadmaps render only when the download is clicked (deferred), and the whole ZIP is buffered in memory
+        # before Streamlit serves it. True streaming: POST /export (skill_roadmap.api) or python -m skill_roadmap.export.
+        @st.fragment
+        @timed_section("export")
+        def export_section(df):
+            with st.expander("📦 Bulk Export (Markdown / JSON / HTML)", expanded=False):
+                source = st.radio("Students", ["Filtered dataset", "Uploaded profile CSV"], horizontal=True,
+                                  key="export_source")
+                filters, upload = {}, None
+                if source == "Filtered dataset":
+                    cols = st.columns(len(FILTER_COLUMNS))
+                    for c, col in zip(cols, FILTER_COLUMNS):
+                        if col in df.columns:
+                            with c:
+                                filters[col] = st.multiselect(column_label(col), column_values(df, col), key=f"export_{col}")
+                    count = len(filter_positions(df, filters))
+                    st.caption(f"{count:,} students" + (" (random sample of a streamed dataset)" if STREAMING else ""))
+                else:
+                    upload = st.file_uploader("Profile CSV (dataset columns, optional 'name')", type="csv",
+                                              key="export_upload")
+                    count = 1 if upload is not None else 0
+                formats = st.multiselect("Formats", list(EXPORT_FORMATS), default=list(EXPORT_FORMATS),
+                                         key="export_formats")
+        
+                def build_zip():
+                    # Streamlit calls this again on every click; read the upload from its start each time
+                    chunks = (csv_chunks(io.BytesIO(upload.getvalue())) if upload is not None
+                              else dataset_chunks(df, filters))
+                    buf = io.BytesIO()
+                    write_zip(buf, iter_roadmaps(chunks, df, index=cohort_index, backoff=backoff, percentiles=percentiles,
+                                          risk=risk),
+                              formats)
+                    return buf.getvalue()  # deferred callables must return str or bytes
+        
+                st.download_button("⬇ Download ZIP", data=build_zip, file_name="roadmaps.zip", mime="application/zip",
+                                   on_click="ignore", disabled=not (count and formats), key="export_download")
+                st.caption("The ZIP is built in memory when you click. For large exports, stream it with "
+                           "`python -m skill_roadmap.export` or `POST /export`.")
+        
+        st.divider()
+        analytics_section()
+        export_section(data)
+        dataset_preview(data)
+        st.caption("Mini Project | Student Skill Roadmap | Streamlit Web App")
+        if st.button("⬅ Back to Dashboard"):
+            st.session_state.page = "home"
+            st.rerun()
+        record_startup("first_render_roadmap", (time.perf_counter() - script_start) * 1000)
+    finally:
+        trace = end_run(run)
+    
+    # ---------------- Timing Panel ----------------
+    if timing:
+        stats = snapshot(st.session_state.session_id)
+        with st.sidebar:
+            st.subheader("This rerun")
+            st.metric("Total", f"{trace['total_ms']:.1f} ms")
+            st.dataframe([{"Span": s["name"], "ms": s["ms"]} for s in trace["spans"]], hide_index=True)
+            st.subheader("Span latency (process)")
+            st.dataframe([{"Span": name, "Calls": h["count"], "Mean ms": round(h["mean_ms"], 2),
+                           "p50 ≤ ms": h["p50_ms"], "p95 ≤ ms": h["p95_ms"]} for name, h in stats["spans"].items()],
+                         hide_index=True)
+            if "session" in stats:
+                st.subheader("This session's reruns")
+                st.caption(f"{stats['session']['count']} runs · mean {stats['session']['mean_ms']:.1f} ms · "
+                           f"p95 ≤ {stats['session']['p95_ms']} ms")
+                st.bar_chart({"runs": stats["session"]["buckets"]})
+            if stats["startup"]:
+                st.subheader("Startup (this process)")
+                st.dataframe([{"Phase": name, "ms": p["ms"], "Done at ms": p["at_ms"]}
+                              for name, p in stats["startup"].items()], hide_index=True)
+            st.subheader("Caches")
+            st.json({"streamlit": stats["caches"], "roadmap": ROADMAP_CACHE.stats()}, expanded=False)
+            st.caption(f"Traces appended to `{TRACE_FILE}` (JSON lines).")
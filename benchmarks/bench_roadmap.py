@@ -0,0 +1,201 @@
+"""Offline benchmarks for the roadmap hot paths.
+
+Generates synthetic datasets with the schema of student_performance_extended.csv,
+times cold and warm calls of each hot path and records peak traced memory:
+
+    python benchmarks/bench_roadmap.py --sizes 10k,1M,10M --output bench_results.json
+    python benchmarks/bench_roadmap.py --sizes 10k --compare old_results.json
+
+Results are written as sorted JSON so two runs can be diffed directly.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_roadmap import (  # noqa: E402
+    JOB_SKILL_ANALYSIS,
+    build_backoff_index,
+    build_cohort_index,
+    compute_skill_gap,
+    generate_structured_roadmap,
+    get_similar_students,
+    load_typed_dataset,
+    roadmap_to_markdown,
+    row_to_profile,
+)
+
+CHOICES = {
+    "year": [1, 2, 3, 4],
+    "branch": ["CSE", "ECE", "EEE", "IT", "Mechanical"],
+    "hostel": ["Day Scholar", "Hostel"],
+    "family_support": ["Low", "Medium", "High"],
+    "interest": ["AI/ML", "Communication Skills", "Competitive Coding", "Data Analysis", "Web Development"],
+    "budget_level": ["Low", "Medium", "High"],
+    "skill_level": ["Beginner", "Intermediate"],
+    "stress_level": ["Low", "Medium", "High"],
+    "communication_level": ["Poor", "Average", "Good"],
+    "confusion_level": ["Low", "Medium", "High"],
+}
+COLUMNS = ["student_id", "year", "branch", "GPA", "study_hours", "failures", "hostel", "sleep_hours",
+           "family_support", "interest", "budget_level", "skill_level", "stress_level",
+           "communication_level", "confusion_level"]
+
+
+def parse_size(text):
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def synthetic_chunk(rng, start, n):
+    data = {"student_id": np.arange(start + 1, start + n + 1)}
+    for col, values in CHOICES.items():
+        data[col] = np.asarray(values, dtype=object)[rng.integers(0, len(values), n)]
+    data["GPA"] = np.round(rng.uniform(4.0, 9.9, n), 2)
+    data["study_hours"] = rng.integers(1, 7, n)
+    data["failures"] = rng.integers(0, 3, n)
+    data["sleep_hours"] = rng.integers(4, 9, n)
+    return pd.DataFrame(data)[COLUMNS]
+
+
+def make_dataset(path, rows, seed=0, chunk=1_000_000):
+    """Write a synthetic CSV in fixed-size chunks (bounded memory); reused if already present."""
+    if os.path.exists(path):
+        return path
+    rng = np.random.default_rng(seed)
+    tmp = path + ".tmp"
+    for start in range(0, rows, chunk):
+        synthetic_chunk(rng, start, min(chunk, rows - start)).to_csv(
+            tmp, mode="a" if start else "w", header=not start, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def measure(fn, setup=None, warm_runs=0):
+    """Cold time, warm median/min over `warm_runs` and peak traced memory of the cold call."""
+    if setup:
+        setup()
+    gc.collect()
+    t = time.perf_counter()
+    fn(0)
+    cold = time.perf_counter() - t
+    warm = []
+    for i in range(warm_runs):
+        t = time.perf_counter()
+        fn(i + 1)
+        warm.append(time.perf_counter() - t)
+    # memory in a separate cold pass so tracing does not skew the timings
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    fn(0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {"cold_s": round(cold, 6), "peak_mb": round(peak / 2**20, 3)}
+    if warm:
+        result.update(warm_median_s=round(statistics.median(warm), 6), warm_min_s=round(min(warm), 6),
+                      warm_runs=len(warm))
+    return result
+
+
+def bench_size(rows, workdir, warm_runs):
+    csv_path = make_dataset(os.path.join(workdir, f"students_{rows}.csv"), rows)
+    cache_dir = os.path.join(workdir, f"cache_{rows}")
+    results = {}
+
+    results["load_data"] = measure(
+        lambda i: load_typed_dataset(csv_path, cache_dir),
+        setup=lambda: shutil.rmtree(cache_dir, ignore_errors=True))
+    results["load_data_sidecar"] = measure(lambda i: load_typed_dataset(csv_path, cache_dir), warm_runs=warm_runs)
+
+    df, _ = load_typed_dataset(csv_path, cache_dir)
+    results["build_cohort_index"] = measure(lambda i: build_cohort_index(df))
+    index = build_cohort_index(df)
+    results["build_backoff_index"] = measure(lambda i: build_backoff_index(index))
+    backoff = build_backoff_index(index)
+    rng = np.random.default_rng(1)
+    profiles = [row_to_profile(df.iloc[int(p)]) for p in rng.integers(0, len(df), warm_runs + 1)]
+
+    # cold = no prebuilt index (what a fresh caller pays), warm = shared index
+    results["get_similar_students"] = measure(lambda i: get_similar_students(df, profiles[0]))
+    results["get_similar_students_indexed"] = measure(
+        lambda i: get_similar_students(df, profiles[i], index=index), warm_runs=warm_runs)
+    results["generate_structured_roadmap"] = measure(lambda i: generate_structured_roadmap(profiles[0], df))
+    results["generate_structured_roadmap_indexed"] = measure(
+        lambda i: generate_structured_roadmap(profiles[i], df, index=index, backoff=backoff), warm_runs=warm_runs)
+
+    roadmaps = [generate_structured_roadmap(p, df, index=index, backoff=backoff) for p in profiles]
+    results["roadmap_to_markdown"] = measure(
+        lambda i: roadmap_to_markdown("Bench Student", profiles[i], roadmaps[i]), warm_runs=warm_runs)
+
+    roles = list(JOB_SKILL_ANALYSIS.values())
+    results["compute_skill_gap"] = measure(
+        lambda i: compute_skill_gap(roles[i % len(roles)]["skills"], roles[(i + 1) % len(roles)]["skills"][:3]),
+        warm_runs=warm_runs)
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+            "machine": platform.machine(), "cpus": os.cpu_count(), "commit": commit}
+
+
+def compare(old, new):
+    """Print warm/cold ratios (new / old) for every function present in both runs."""
+    for size, funcs in new["results"].items():
+        for name, stats in funcs.items():
+            before = old.get("results", {}).get(size, {}).get(name)
+            if not before:
+                continue
+            for key in ("cold_s", "warm_median_s", "peak_mb"):
+                if before.get(key) and key in stats:
+                    ratio = stats[key] / before[key]
+                    flag = "  <-- regression" if ratio > 1.2 else ""
+                    print(f"{size:>10} {name:<38} {key:<14} {before[key]:>10.4f} -> {stats[key]:>10.4f} ({ratio:.2f}x){flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the roadmap hot paths on synthetic data.")
+    parser.add_argument("--sizes", default="10k,1M,10M", help="comma-separated row counts (k/M suffixes)")
+    parser.add_argument("--warm-runs", type=int, default=20)
+    parser.add_argument("--workdir", default=".bench_data", help="where synthetic CSVs and sidecars are kept")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args(argv)
+    os.makedirs(args.workdir, exist_ok=True)
+
+    report = {"environment": environment(), "results": {}}
+    for size in [parse_size(s) for s in args.sizes.split(",") if s.strip()]:
+        print(f"benchmarking {size:,} rows ...", file=sys.stderr)
+        report["results"][str(size)] = bench_size(size, args.workdir, args.warm_runs)
+
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+    print(f"wrote {args.output}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare) as fh:
+            compare(json.load(fh), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Local load test for the roadmap JSON API (skill_roadmap.api).
+
+Opens `--concurrency` keep-alive connections and fires `--requests` calls,
+reporting p50/p99 latency and throughput:
+
+    python -m skill_roadmap.api --port 8000 &
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --endpoint roadmap --requests 5000 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from urllib.parse import urlparse
+
+import pandas as pd
+
+DATA_PATH = "student_performance_extended.csv"
+
+
+def sample_payloads(data_path, n, batch_size, seed=0):
+    """Request bodies built from real dataset rows, one per request (cycled)."""
+    rows = pd.read_csv(data_path, nrows=5000).rename(columns={"GPA": "gpa"}).to_dict("records")
+    rng = random.Random(seed)
+    skills = ["Python", "Git & GitHub", "Statistics", "HTML", "CSS", "JavaScript", "Databases (SQL)", "React"]
+    payloads = {
+        "roadmap": lambda: {"profile": rng.choice(rows), "markdown": True},
+        "roadmap/batch": lambda: {"profiles": [{"profile": rng.choice(rows)} for _ in range(batch_size)]},
+        "skill-gap": lambda: {"known_skills": rng.sample(skills, 3)},
+        "skill-gap/batch": lambda: {"students": [rng.sample(skills, 3) for _ in range(batch_size)]},
+    }
+    return payloads, rows
+
+
+async def worker(host, port, path, bodies, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            raw = json.dumps(body, default=str).encode()
+            t = time.perf_counter()
+            writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(raw)}\r\n\r\n".encode() + raw)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - t)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(args):
+    url = urlparse(args.url)
+    payloads, _ = sample_payloads(args.data, args.requests, args.batch_size)
+    make = payloads[args.endpoint]
+    bodies = [make() for _ in range(args.requests)]
+    per_worker = [bodies[i::args.concurrency] for i in range(args.concurrency)]
+    latencies, errors = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(url.hostname, url.port or 80, "/" + args.endpoint, chunk, latencies, errors)
+                           for chunk in per_worker if chunk))
+    elapsed = time.perf_counter() - started
+    report = {
+        "endpoint": args.endpoint,
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "errors": len(errors),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+    }
+    if args.endpoint.endswith("/batch"):
+        report["batch_size"] = args.batch_size
+        report["items_per_s"] = round(report["throughput_rps"] * args.batch_size, 1)
+    print(json.dumps(report, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the roadmap JSON API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", default="roadmap", choices=["roadmap", "roadmap/batch", "skill-gap", "skill-gap/batch"])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--data", default=DATA_PATH, help="dataset to sample request profiles from")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run(args))
+    except ConnectionRefusedError:
+        sys.exit(f"could not connect to {args.url}; start it with: python -m skill_roadmap.api")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Streamlit-free core of the Student Skill Roadmap app.
+
+Names are imported from their submodules on first access, so `import skill_roadmap`
+(or a light submodule such as skill_roadmap.assets) does not pull in pandas,
+NumPy or scikit-learn; skill_roadmap.warmup loads those in the background.
+"""
+import importlib
+
+# public name -> submodule it lives in
+_EXPORTS = {
+    "ROADMAP_CACHE": "cache", "LRUCache": "cache", "RoadmapCache": "cache",
+    "DATA_PATH": "data", "backoff_lookup": "data", "build_backoff_index": "data", "build_cohort_index": "data",
+    "dataset_version": "data", "extend_backoff_index": "data", "extend_cohort_index": "data",
+    "get_similar_students": "data", "index_backoff": "data",
+    "load_typed_dataset": "data", "lookup_cohort": "data", "normalize_yes_no": "data", "profiles_frame": "data",
+    "row_to_profile": "data", "similar_rows": "data",
+    "build_week_plan": "engine", "generate_structured_roadmap": "engine", "roadmap_to_markdown": "engine",
+    "write_roadmap_markdown": "engine",
+    "stream_dataset": "ingest",
+    "QuantileSketch": "percentiles", "build_percentile_index": "percentiles", "extend_percentile_index": "percentiles",
+    "percentile_lookup": "percentiles",
+    "DatasetStore": "refresh",
+    "assess_risk": "risk", "build_risk_index": "risk", "extend_risk_index": "risk", "load_risk_model": "risk",
+    "score_frame": "risk",
+    "RULES": "rules", "evaluate_rules": "rules", "evaluate_rules_frame": "rules", "rule_masks": "rules",
+    "attach_dataset": "shared", "publish_dataset": "shared",
+    "build_knn_index": "similarity", "knn_lookup": "similarity", "knn_similar_students": "similarity",
+    "JOB_SKILL_ANALYSIS": "skills", "SKILL_CATALOG": "skills", "compute_skill_gap": "skills",
+    "rank_roles": "skills", "rank_roles_batch": "skills", "skill_matrix": "skills",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip this hook
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
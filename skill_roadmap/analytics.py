@@ -0,0 +1,136 @@
+"""Precomputed analytics cube: counts, means and fixed-bin histograms by category.
+
+One vectorized pass turns the rows into "cells", one per observed
+combination of the cube dimensions. Each cell holds a row count, per-measure
+sums and non-null counts, and per-measure histogram counts over fixed bin
+edges. Cells from separate chunks merge by addition, so a streamed dataset
+builds the same cube (ingest.stream_dataset). Every grouping set of up to
+two dimensions is rolled up from the cells ahead of time. Charts then read
+those pre-binned rollups and never touch raw rows, whatever the dataset size.
+"""
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from .instrument import traced
+
+CUBE_DIMENSIONS = ["year", "branch", "interest", "skill_level", "stress_level", "hostel"]
+CUBE_MEASURES = ["gpa", "study_hours", "sleep_hours", "failures"]
+# fixed edges, so chunks and dataset versions bin identically; values outside land in the end bins
+HISTOGRAM_BINS = {
+    "gpa": np.linspace(0.0, 10.0, 21),
+    "study_hours": np.arange(0.0, 13.0),
+    "sleep_hours": np.arange(0.0, 13.0),
+}
+MAX_ROLLUP_DIMS = 2
+
+
+def hist_columns(measure):
+    return [f"{measure}_h{i:02d}" for i in range(len(HISTOGRAM_BINS[measure]) - 1)]
+
+
+def bin_labels(measure):
+    edges = HISTOGRAM_BINS[measure]
+    return [f"{lo:g}–{hi:g}" for lo, hi in zip(edges[:-1], edges[1:])]
+
+
+def aggregate_cells(df):
+    """Cells of one frame (or chunk): dimension values + count, sums, non-null counts and histograms."""
+    dims = [d for d in CUBE_DIMENSIONS if d in df.columns]
+    measures = [m for m in CUBE_MEASURES if m in df.columns]
+    codes, levels = [], []
+    for d in dims:
+        col = df[d] if isinstance(df[d].dtype, pd.CategoricalDtype) else df[d].astype("category")
+        codes.append(col.cat.codes.to_numpy().astype(np.int64))
+        levels.append(col.cat.categories)
+    shape = [max(1, len(lv)) for lv in levels]
+    valid = np.all(np.vstack(codes) >= 0, axis=0) if dims else np.ones(len(df), dtype=bool)
+    cell = np.ravel_multi_index([c[valid] for c in codes], shape) if dims else np.zeros(int(valid.sum()), np.int64)
+    cells, inv = np.unique(cell, return_inverse=True)
+    n = len(cells)
+    out = {d: lv.take(u) for d, lv, u in zip(dims, levels, np.unravel_index(cells, shape))}
+    out["count"] = np.bincount(inv, minlength=n)
+    for m in measures:
+        values = pd.to_numeric(df[m], errors="coerce").to_numpy(dtype=float)[valid]
+        ok = ~np.isnan(values)
+        out[f"{m}_sum"] = np.bincount(inv[ok], weights=values[ok], minlength=n)
+        out[f"{m}_n"] = np.bincount(inv[ok], minlength=n)
+        if m in HISTOGRAM_BINS:
+            edges = HISTOGRAM_BINS[m]
+            nbins = len(edges) - 1
+            b = np.clip(np.searchsorted(edges, values[ok], side="right") - 1, 0, nbins - 1)
+            hist = np.bincount(inv[ok] * nbins + b, minlength=n * nbins).reshape(n, nbins)
+            out.update(zip(hist_columns(m), hist.T))
+    return pd.DataFrame(out)
+
+
+def merge_cells(frames):
+    """Add up cells (e.g. from several chunks) that share dimension values."""
+    frames = [f for f in frames if f is not None]
+    if len(frames) == 1:
+        return frames[0]
+    cells = pd.concat(frames, ignore_index=True)
+    dims = [d for d in CUBE_DIMENSIONS if d in cells.columns]
+    if not dims:
+        return rollup_cells(cells, ())
+    return cells.groupby(dims, sort=False, dropna=True, observed=True).sum().reset_index()
+
+
+def rollup_cells(cells, by):
+    by = list(by)
+    if not by:
+        return pd.DataFrame({c: [cells[c].sum()] for c in cells.columns if c not in CUBE_DIMENSIONS})
+    return cells.groupby(by, sort=True, dropna=True, observed=True).sum(numeric_only=True).reset_index()
+
+
+@traced()
+def build_cube(cells):
+    """The cube: merged cells plus every rollup over at most MAX_ROLLUP_DIMS dimensions."""
+    dims = [d for d in CUBE_DIMENSIONS if d in cells.columns]
+    rollups = {}
+    for k in range(MAX_ROLLUP_DIMS + 1):
+        for by in combinations(dims, k):
+            rollups[by] = rollup_cells(cells, by)
+    measures = [m for m in CUBE_MEASURES if f"{m}_sum" in cells.columns]
+    return {"dimensions": dims, "measures": measures, "cells": cells, "rollups": rollups,
+            "rows": int(cells["count"].sum())}
+
+
+def rollup_key(cube, by):
+    return tuple(d for d in cube["dimensions"] if d in by)
+
+
+def rollup(cube, by=()):
+    """Rollup frame for a grouping set, in dimension order; precomputed sets are a dict lookup."""
+    by = rollup_key(cube, by)
+    found = cube["rollups"].get(by)
+    return found if found is not None else rollup_cells(cube["cells"], by)
+
+
+def summary(cube, by=()):
+    """Count and means per group, e.g. mean GPA / study hours by branch and year."""
+    frame = rollup(cube, by)
+    out = frame[list(rollup_key(cube, by))].copy()
+    out["students"] = frame["count"]
+    for m in cube["measures"]:
+        n = frame[f"{m}_n"].to_numpy(dtype=float)
+        out[f"mean_{m}"] = np.divide(frame[f"{m}_sum"].to_numpy(dtype=float), n,
+                                     out=np.full(len(n), np.nan), where=n > 0)
+    return out
+
+
+def histogram(cube, measure, by=None):
+    """Pre-binned counts of `measure`: one row per bin, one column per value of `by` (or "all")."""
+    frame = rollup(cube, (by,) if by else ())
+    counts = frame[hist_columns(measure)].to_numpy().T
+    columns = [str(v) for v in frame[by]] if by else ["all"]
+    return pd.DataFrame(counts, index=pd.Index(bin_labels(measure), name=measure), columns=columns)
+
+
+def crosstab(cube, rows, columns):
+    """Student counts for two dimensions, e.g. stress level by branch."""
+    frame = rollup(cube, (rows, columns))
+    table = frame.pivot_table(index=rows, columns=columns, values="count", aggfunc="sum", fill_value=0, observed=True)
+    table.columns = [str(c) for c in table.columns]
+    return table
@@ -0,0 +1,343 @@
+"""Standalone asyncio JSON API for roadmap and skill-gap generation.
+
+    python -m skill_roadmap.api --host 127.0.0.1 --port 8000
+
+The dataset, cohort index, percentile arrays and (lazily) the kNN index are
+loaded once per process and shared read-only by every request. Endpoints:
+
+    GET  /health
+    GET  /roles                  JOB_SKILL_ANALYSIS
+    POST /roadmap                {"profile": {...}, "name": "...", "similarity": "exact|knn", "markdown": true}
+    POST /roadmap/batch          {"profiles": [{"profile": {...}, "name": "..."}, ...], "markdown": false}
+    POST /markdown               {"profile": {...}, "name": "..."}
+    POST /skill-gap              {"known_skills": [...], "role": "..."}  (no role: rank every role)
+    POST /skill-gap/batch        {"students": [[...], [...]]}
+    POST /export                 {"filters": {"branch": ["CSE"]}} or {"profiles": [...]}, "formats": ["md", "json", "html"]
+                                 -> application/zip, streamed (chunked) while the roadmaps render
+
+Profiles accept either roadmap keys (budget, communication) or dataset
+columns (budget_level, communication_level).
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import types
+from contextlib import nullcontext
+from http import HTTPStatus
+
+import numpy as np
+import pandas as pd
+
+from .cache import ROADMAP_CACHE
+from .data import DATA_PATH, build_backoff_index, build_cohort_index, dataset_version, load_typed_dataset, row_to_profile
+from .engine import generate_structured_roadmap, roadmap_to_markdown
+from .export import EXPORT_FORMATS, coerce_filters, dataset_chunks, iter_roadmaps, iter_zip
+from .instrument import trace_run
+from .percentiles import build_percentile_index
+from .risk import build_risk_index, load_risk_model, score_frame
+from .rules import evaluate_rules_frame
+from .shared import attach_dataset
+from .similarity import build_knn_index
+from .skills import JOB_SKILL_ANALYSIS, SKILL_CATALOG, compute_skill_gap, rank_roles, rank_roles_batch, skill_matrix
+
+REQUIRED_PROFILE_KEYS = ("interest", "skill_level", "budget")
+MAX_BODY = 32 * 2**20
+MAX_BATCH = 10_000
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class RoadmapService:
+    """Process-wide, read-only state shared by every request."""
+
+    def __init__(self, data_path=DATA_PATH, shared=False):
+        if shared:
+            # several API processes map one published copy (see skill_roadmap.shared)
+            current = attach_dataset(data_path)
+            self.version, self.df, self.options = current["version"], current["df"], current["options"]
+            self.index, self.backoff, self.percentiles = current["index"], current["backoff"], current["percentiles"]
+        else:
+            self.version = dataset_version(data_path)
+            self.df, self.options = load_typed_dataset(data_path)
+            self.index = build_cohort_index(self.df)
+            self.percentiles = build_percentile_index(self.df, self.index)
+            self.backoff = build_backoff_index(self.index)
+        artifact = load_risk_model()
+        self.risk = build_risk_index(artifact, self.df) if artifact is not None else None
+        self._knn = None
+        self._knn_lock = threading.Lock()
+
+    @property
+    def knn_ready(self):
+        return self._knn is not None
+
+    @property
+    def knn(self):
+        # built once, on first use; dispatch runs that request off the event loop
+        if self._knn is None:
+            with self._knn_lock:
+                if self._knn is None:
+                    self._knn = build_knn_index(self.df)
+        return self._knn
+
+    def profile(self, raw):
+        if not isinstance(raw, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "'profile' must be an object")
+        info = row_to_profile(raw)
+        missing = [k for k in REQUIRED_PROFILE_KEYS if info.get(k) is None]
+        if missing:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"profile is missing: {', '.join(missing)}")
+        return info
+
+    def roadmap_kwargs(self, similarity):
+        if similarity == "knn":
+            return {"similarity": "knn", "knn": self.knn, "percentiles": self.percentiles, "risk": self.risk}
+        if similarity in (None, "exact"):
+            return {"similarity": "exact", "index": self.index, "backoff": self.backoff, "percentiles": self.percentiles,
+                    "risk": self.risk}
+        raise ApiError(HTTPStatus.BAD_REQUEST, "similarity must be 'exact' or 'knn'")
+
+    def roadmap(self, body):
+        info = self.profile(body.get("profile"))
+        kwargs = self.roadmap_kwargs(body.get("similarity"))
+        out = {"profile": info, "roadmap": ROADMAP_CACHE.roadmap(info, self.df, self.version, **kwargs)}
+        if body.get("markdown"):
+            name = body.get("name") or "Student"
+            out["markdown"] = ROADMAP_CACHE.roadmap_markdown(name, info, self.df, self.version, **kwargs)
+        return out
+
+    def roadmap_batch(self, body):
+        items = body.get("profiles")
+        if not isinstance(items, list) or not items:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "'profiles' must be a non-empty list")
+        if len(items) > MAX_BATCH:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"at most {MAX_BATCH} profiles per batch")
+        infos = [self.profile(item.get("profile") if isinstance(item, dict) else None) for item in items]
+        kwargs = self.roadmap_kwargs(body.get("similarity"))
+        # one vectorized rule pass (and one risk scoring call) for the whole batch
+        frame = pd.DataFrame(infos)
+        sections = evaluate_rules_frame(frame)
+        scores = score_frame(self.risk["artifact"], frame) if self.risk is not None else [None] * len(infos)
+        results = []
+        for item, info, sec, score in zip(items, infos, sections, scores):
+            roadmap = generate_structured_roadmap(info, self.df, sections=sec, risk_score=score, **kwargs)
+            out = {"profile": info, "roadmap": roadmap}
+            if body.get("markdown"):
+                out["markdown"] = roadmap_to_markdown(item.get("name") or "Student", info, roadmap)
+            results.append(out)
+        return {"results": results}
+
+    def markdown(self, body):
+        info = self.profile(body.get("profile"))
+        kwargs = self.roadmap_kwargs(body.get("similarity"))
+        name = body.get("name") or "Student"
+        return {"markdown": ROADMAP_CACHE.roadmap_markdown(name, info, self.df, self.version, **kwargs)}
+
+    def export(self, body):
+        """Validate eagerly, then return a generator of ZIP bytes for handle_connection to stream."""
+        formats = body.get("formats") or list(EXPORT_FORMATS)
+        if not isinstance(formats, list) or not set(formats) <= set(EXPORT_FORMATS):
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"'formats' must be a subset of {list(EXPORT_FORMATS)}")
+        kwargs = self.roadmap_kwargs(body.get("similarity"))
+        if body.get("profiles") is not None:
+            items = body["profiles"]
+            if not isinstance(items, list):
+                raise ApiError(HTTPStatus.BAD_REQUEST, "'profiles' must be a list")
+            infos = [self.profile(item.get("profile") if isinstance(item, dict) else None) for item in items]
+            names = [item.get("name") for item in items]
+            chunks = [pd.DataFrame(infos).assign(name=names)] if infos else []
+        else:
+            filters = body.get("filters") or {}
+            if not isinstance(filters, dict) or not all(isinstance(v, list) for v in filters.values()):
+                raise ApiError(HTTPStatus.BAD_REQUEST, "'filters' must map columns to lists of values")
+            unknown = [c for c in filters if c not in self.df.columns]
+            if unknown:
+                raise ApiError(HTTPStatus.BAD_REQUEST, f"unknown filter column(s): {', '.join(unknown)}")
+            chunks = dataset_chunks(self.df, coerce_filters(self.df, filters))
+        return iter_zip(iter_roadmaps(chunks, self.df, **kwargs), formats)
+
+    def skill_gap(self, body):
+        known_skills = body.get("known_skills")
+        if not isinstance(known_skills, list):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "'known_skills' must be a list")
+        role = body.get("role")
+        if role is None:
+            top = body.get("top")
+            if top is not None and (not isinstance(top, int) or isinstance(top, bool) or top < 1):
+                raise ApiError(HTTPStatus.BAD_REQUEST, "'top' must be a positive integer")
+            return {"ranking": rank_roles(known_skills, top=top)}
+        if role not in JOB_SKILL_ANALYSIS:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"unknown role: {role}")
+        known, missing = compute_skill_gap(JOB_SKILL_ANALYSIS[role]["skills"], known_skills)
+        return {"role": role, "known": known, "missing": missing}
+
+    def skill_gap_batch(self, body):
+        students = body.get("students")
+        if not isinstance(students, list) or not all(isinstance(s, list) for s in students):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "'students' must be a list of skill lists")
+        if len(students) > MAX_BATCH:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"at most {MAX_BATCH} students per batch")
+        coverage = rank_roles_batch(skill_matrix(students))
+        roles = SKILL_CATALOG["roles"]
+        best = np.argmax(coverage, axis=1) if len(students) else []
+        return {"roles": roles, "coverage": np.round(coverage, 4).tolist(),
+                "best_role": [roles[i] for i in best]}
+
+
+ROUTES = {
+    ("POST", "/roadmap"): ("roadmap", False),
+    ("POST", "/roadmap/batch"): ("roadmap_batch", True),
+    ("POST", "/markdown"): ("markdown", False),
+    ("POST", "/skill-gap"): ("skill_gap", False),
+    ("POST", "/skill-gap/batch"): ("skill_gap_batch", True),
+    ("POST", "/export"): ("export", False),  # returns a generator, streamed by handle_connection
+}
+
+
+async def read_request(reader):
+    """Parse one HTTP/1.1 request; returns None when the client closed the connection."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+    if length < 0:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+    if length > MAX_BODY:
+        raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target.split("?", 1)[0], version, headers, body
+
+
+def encode_response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def write_stream(writer, parts, keep_alive):
+    """Send a generator of ZIP bytes with chunked encoding, producing each part off the event loop."""
+    loop = asyncio.get_running_loop()
+    writer.write(("HTTP/1.1 200 OK\r\n"
+                  "Content-Type: application/zip\r\n"
+                  'Content-Disposition: attachment; filename="roadmaps.zip"\r\n'
+                  "Transfer-Encoding: chunked\r\n"
+                  f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1"))
+    while True:
+        part = await loop.run_in_executor(None, next, parts, None)
+        if part is None:
+            break
+        if part:
+            writer.write(f"{len(part):X}\r\n".encode("latin-1") + part + b"\r\n")
+            await writer.drain()
+    writer.write(b"0\r\n\r\n")
+
+
+async def dispatch(service, method, path, body):
+    if path == "/health" and method == "GET":
+        return {"status": "ok", "dataset_version": service.version, "rows": len(service.df),
+                "risk_model": service.risk["artifact"].get("version") if service.risk else None,
+                "cache": ROADMAP_CACHE.stats()}
+    if path == "/roles" and method == "GET":
+        return JOB_SKILL_ANALYSIS
+    route = ROUTES.get((method, path))
+    if route is None:
+        allowed = any(p == path for _, p in ROUTES)
+        raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED if allowed else HTTPStatus.NOT_FOUND, f"{method} {path}")
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "body is not valid JSON")
+    if not isinstance(payload, dict):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "body must be a JSON object")
+    handler, bulk = route
+    fn = getattr(service, handler)
+    if bulk or (payload.get("similarity") == "knn" and not service.knn_ready):
+        # bulk calls, and the call that builds the kNN index, run off the event loop so single requests keep flowing
+        return await asyncio.get_running_loop().run_in_executor(None, fn, payload)
+    return fn(payload)
+
+
+async def handle_connection(service, reader, writer, trace=False):
+    try:
+        while True:
+            keep_alive = False
+            try:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, path, version, headers, body = request
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                with trace_run("api", f"{method} {path}") if trace else nullcontext():
+                    status, payload = HTTPStatus.OK, await dispatch(service, method, path, body)
+                if isinstance(payload, types.GeneratorType):
+                    # the status line is already out once streaming starts: a failure just drops the connection
+                    try:
+                        await write_stream(writer, payload, keep_alive)
+                    except Exception:
+                        break
+                    if not keep_alive:
+                        break
+                    continue
+            except ApiError as exc:
+                status, payload = exc.status, {"error": str(exc)}
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            except Exception as exc:  # keep serving other requests
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(exc).__name__}: {exc}"}
+            writer.write(encode_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(host, port, data_path=DATA_PATH, trace=False, shared=False):
+    service = RoadmapService(data_path, shared)
+    server = await asyncio.start_server(lambda r, w: handle_connection(service, r, w, trace), host, port)
+    print(f"Serving roadmap API on http://{host}:{port} ({len(service.df):,} students)", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roadmap / skill-gap JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--trace", action="store_true", help="append per-request traces to ROADMAP_TRACE_FILE")
+    parser.add_argument("--shared", action="store_true", default=os.environ.get("ROADMAP_DATA_MODE") == "shared",
+                        help="attach the dataset published for all worker processes (ROADMAP_DATA_MODE=shared)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.data, args.trace, args.shared))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
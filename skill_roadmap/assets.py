@@ -0,0 +1,98 @@
+"""Resized, recompressed variants of the app's images, generated once and cached on disk.
+
+The 3840px hero JPEG becomes WebP and JPEG at a few widths under
+<ASSET_DIR>/<name>-<size>-<mtime>/, so a changed source gets fresh variants.
+A variant set is written under a temporary name and renamed into place, the
+same way as skill_roadmap.shared. The page asks for the width it shows and
+gets the smallest variant at least that wide. Pre-generate at deploy time
+with:
+
+    python -m skill_roadmap.assets
+
+This module only needs the standard library to serve variants that already
+exist. Pillow, which ships with Streamlit, is imported only to build them.
+Without it the original file is served.
+"""
+import argparse
+import os
+import shutil
+import sys
+
+HERO_IMAGE = "vitaly-gariev-Sc2iIlwScic-unsplash.jpg"
+# data.CACHE_DIR's root; not imported from there, which would pull in pandas
+ASSET_DIR = os.environ.get("ROADMAP_ASSET_DIR", os.path.join(".data_cache", "assets"))
+VARIANT_WIDTHS = (640, 1280, 1920)
+# preferred first; every browser Streamlit supports decodes WebP, JPEG is the fallback
+VARIANT_FORMATS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 6},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+
+
+def variant_dir(src, asset_dir=ASSET_DIR):
+    stat = os.stat(src)
+    stem = os.path.splitext(os.path.basename(src))[0]
+    return os.path.join(asset_dir, f"{stem}-{stat.st_size}-{stat.st_mtime_ns}")
+
+
+def build_variants(src, asset_dir=ASSET_DIR, widths=VARIANT_WIDTHS, formats=VARIANT_FORMATS):
+    """Write every width x format variant of `src` unless present; returns the variant directory."""
+    target = variant_dir(src, asset_dir)
+    if os.path.isdir(target):
+        return target
+    from PIL import Image, ImageOps
+
+    os.makedirs(asset_dir, exist_ok=True)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    with Image.open(src) as im:
+        im = ImageOps.exif_transpose(im).convert("RGB")
+        for width in widths:
+            # never upscale: narrower sources just repeat their own width
+            size = (min(width, im.width), round(im.height * min(width, im.width) / im.width))
+            resized = im.resize(size, Image.Resampling.LANCZOS) if size != im.size else im
+            for ext, options in formats.items():
+                resized.save(os.path.join(tmp, f"{width}.{ext}"), **options)
+    try:
+        os.replace(tmp, target)
+    except OSError:  # another process got there first
+        shutil.rmtree(tmp, ignore_errors=True)
+    return target
+
+
+def pick_variant(src, width, asset_dir=ASSET_DIR, build=True):
+    """Path of the smallest variant of `src` at least `width` px wide, in the preferred format.
+
+    Builds missing variants unless `build` is false (the home page leaves that to
+    skill_roadmap.warmup); falls back to `src` while there are none.
+    """
+    try:
+        target = build_variants(src, asset_dir) if build else variant_dir(src, asset_dir)
+    except (ImportError, OSError, ValueError) as exc:
+        print(f"serving {src} unresized: {exc}", file=sys.stderr)
+        return src
+    widths = sorted(VARIANT_WIDTHS)
+    chosen = next((w for w in widths if w >= width), widths[-1])
+    for ext in VARIANT_FORMATS:
+        path = os.path.join(target, f"{chosen}.{ext}")
+        if os.path.exists(path):
+            return path
+    return src
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-generate resized image variants.")
+    parser.add_argument("images", nargs="*", default=[HERO_IMAGE])
+    parser.add_argument("--out", default=ASSET_DIR)
+    args = parser.parse_args(argv)
+    for src in args.images:
+        target = build_variants(src, args.out)
+        original = os.path.getsize(src)
+        for name in sorted(os.listdir(target), key=lambda n: (int(n.split(".")[0]), n)):
+            size = os.path.getsize(os.path.join(target, name))
+            print(f"{os.path.join(target, name)}  {size / 1024:,.0f} KiB ({size / original:.0%} of the original)")
+
+
+if __name__ == "__main__":
+    main()
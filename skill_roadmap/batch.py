@@ -0,0 +1,178 @@
+"""Headless batch roadmap generation.
+
+Streams student profiles from a CSV, fans chunks out to a process pool and
+writes sharded Markdown/JSONL output in input order:
+
+    python -m skill_roadmap.batch intake.csv --out roadmaps --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .data import CACHE_DIR, COLUMN_ALIASES, DATA_PATH, profiles_frame, row_to_profile
+from .engine import generate_structured_roadmap, roadmap_to_markdown
+from .risk import build_risk_index, load_risk_model, score_frame
+from .rules import evaluate_rules_frame
+from .shared import attach_dataset, publish_dataset
+
+FORMATS = ("md", "jsonl")
+
+# per-process state, filled once by init_worker
+_WORKER = {}
+
+
+def init_worker(data_path, cache_dir):
+    # every worker maps the same published files instead of holding its own copy
+    current = attach_dataset(data_path, os.path.join(cache_dir, "shared"))
+    _WORKER["df"] = current["df"]
+    _WORKER["index"] = current["index"]
+    _WORKER["backoff"] = current["backoff"]
+    _WORKER["percentiles"] = current["percentiles"]
+    artifact = load_risk_model()
+    _WORKER["risk"] = build_risk_index(artifact, current["df"]) if artifact is not None else None
+
+
+def profile_name(row, position):
+    name = row.get("name")
+    if isinstance(name, str) and name.strip():
+        return name.strip()
+    sid = row.get("student_id")
+    return f"Student {sid}" if sid is not None and sid == sid else f"Student #{position + 1}"
+
+
+def render_chunk(start, chunk, formats):
+    """Build roadmaps for one chunk of rows; returns (start, [(md, json_line), ...])."""
+    df, index, risk = _WORKER["df"], _WORKER["index"], _WORKER["risk"]
+    profiles = profiles_frame(chunk)
+    all_sections = evaluate_rules_frame(profiles)
+    scores = score_frame(risk["artifact"], profiles) if risk is not None else [None] * len(chunk)
+    out = []
+    for offset, row in enumerate(chunk.to_dict("records")):
+        info = row_to_profile(row)
+        name = profile_name(row, start + offset)
+        roadmap = generate_structured_roadmap(info, df, index=index, backoff=_WORKER["backoff"],
+                                              sections=all_sections[offset], percentiles=_WORKER["percentiles"],
+                                              risk=risk, risk_score=scores[offset])
+        md = roadmap_to_markdown(name, info, roadmap) if "md" in formats else None
+        line = json.dumps({"name": name, "profile": info, "roadmap": roadmap}, ensure_ascii=False, default=str) if "jsonl" in formats else None
+        out.append((md, line))
+    return start, out
+
+
+class ShardWriter:
+    """Rotates output files every `shard_size` roadmaps: roadmaps-00000.md, roadmaps-00000.jsonl, ..."""
+
+    def __init__(self, out_dir, formats, shard_size):
+        self.out_dir, self.formats, self.shard_size = out_dir, formats, shard_size
+        self.shard, self.in_shard, self.files = -1, 0, {}
+        os.makedirs(out_dir, exist_ok=True)
+
+    def _rotate(self):
+        self.close()
+        self.shard += 1
+        self.in_shard = 0
+        self.files = {
+            fmt: open(os.path.join(self.out_dir, f"roadmaps-{self.shard:05d}.{fmt}"), "w", encoding="utf-8")
+            for fmt in self.formats
+        }
+
+    def write(self, md, line):
+        if not self.files or self.in_shard >= self.shard_size:
+            self._rotate()
+        if "md" in self.files:
+            if self.in_shard:
+                self.files["md"].write("\n---\n\n")
+            self.files["md"].write(md)
+            self.files["md"].write("\n")
+        if "jsonl" in self.files:
+            self.files["jsonl"].write(line)
+            self.files["jsonl"].write("\n")
+        self.in_shard += 1
+
+    def close(self):
+        for fh in self.files.values():
+            fh.close()
+        self.files = {}
+
+
+def print_progress(done, elapsed):
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"\r{done} roadmaps ({rate:,.0f}/s)", end="", file=sys.stderr, flush=True)
+
+
+def run_batch(input_path, out_dir, workers=None, chunk_size=1000, shard_size=10000,
+              formats=FORMATS, data_path=DATA_PATH, cache_dir=CACHE_DIR, progress=print_progress):
+    """Generate roadmaps for every row of `input_path`; returns the number written.
+
+    At most `2 * workers` chunks are in flight, so memory stays bounded regardless
+    of input size, and results are written in input order.
+    """
+    workers = workers or os.cpu_count() or 1
+    formats = tuple(f for f in FORMATS if f in formats)
+    writer = ShardWriter(out_dir, formats, shard_size)
+    reader = pd.read_csv(input_path, chunksize=chunk_size)
+    done, started = 0, time.perf_counter()
+
+    def drain(result):
+        nonlocal done
+        for md, line in result[1]:
+            writer.write(md, line)
+        done += len(result[1])
+        if progress:
+            progress(done, time.perf_counter() - started)
+
+    try:
+        if workers <= 1:
+            init_worker(data_path, cache_dir)
+            start = 0
+            for chunk in reader:
+                chunk = chunk.rename(columns=COLUMN_ALIASES)
+                drain(render_chunk(start, chunk, formats))
+                start += len(chunk)
+        else:
+            publish_dataset(data_path, os.path.join(cache_dir, "shared"))  # once, before the workers attach
+            with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(data_path, cache_dir)) as pool:
+                pending, start = deque(), 0
+                for chunk in reader:
+                    chunk = chunk.rename(columns=COLUMN_ALIASES)
+                    pending.append(pool.submit(render_chunk, start, chunk, formats))
+                    start += len(chunk)
+                    if len(pending) >= 2 * workers:
+                        drain(pending.popleft().result())
+                while pending:
+                    drain(pending.popleft().result())
+    finally:
+        writer.close()
+        if progress:
+            print(file=sys.stderr)
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate roadmaps for a CSV of student profiles.")
+    parser.add_argument("input", help="CSV shaped like student_performance_extended.csv (optional 'name' column)")
+    parser.add_argument("--out", default="roadmaps", help="output directory for the shards")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: CPU count, 1 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--shard-size", type=int, default=10000, help="roadmaps per output file")
+    parser.add_argument("--formats", default="md,jsonl", help="comma-separated subset of: md, jsonl")
+    parser.add_argument("--data", default=DATA_PATH, help="reference dataset for the similar-student stats")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+    n = run_batch(args.input, args.out, args.workers, args.chunk_size, args.shard_size, formats,
+                  data_path=args.data, progress=None if args.quiet else print_progress)
+    print(f"Wrote {n} roadmaps to {args.out}/", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
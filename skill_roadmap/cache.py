@@ -0,0 +1,129 @@
+"""Shared, thread-safe LRU memoization for roadmaps and their Markdown.
+
+A roadmap only depends on a small discrete profile (the categorical fields
+plus which side of each rule threshold gpa/study_hours fall on), so identical
+or near-identical profiles from different sessions share one cache entry.
+"""
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date
+
+from .engine import MARKDOWN_PROFILE_KEYS, generate_structured_roadmap, roadmap_to_markdown
+from .rules import RULES
+
+DEFAULT_CACHE_SIZE = int(os.environ.get("ROADMAP_CACHE_SIZE", "1024"))
+
+# categorical inputs of generate_structured_roadmap (exact cohort mode)
+ROADMAP_KEYS = ["year", "branch", "interest", "skill_level", "budget", "hostel",
+                "stress_level", "confusion_level", "communication", "family_support"]
+RAW_NUMERIC_KEYS = ("year", "gpa", "study_hours", "sleep_hours", "failures")
+
+
+def _thresholds(rules):
+    """key -> sorted '<' thresholds used anywhere in the rule table."""
+    found = {}
+
+    def walk(cond):
+        if cond[0] in ("any", "all", "not"):
+            for c in cond[1:]:
+                walk(c)
+        elif cond[0] == "<":
+            found.setdefault(cond[1], set()).add(cond[2])
+
+    for rule in rules:
+        walk(rule["when"])
+    return {k: sorted(v) for k, v in found.items()}
+
+
+BUCKETS = _thresholds(RULES)
+
+
+def profile_key(info, similarity="exact", raw_numerics=False):
+    """Normalized cache key: categoricals as-is, numerics bucketed by the rule thresholds.
+
+    kNN mode uses the raw numerics too, since neighbours depend on them, and so
+    do roadmaps with percentile standing or a risk score (`raw_numerics=True`).
+    """
+    key = [similarity]
+    key.extend(str(info.get(k)) for k in ROADMAP_KEYS)
+    for k, cuts in BUCKETS.items():
+        value = info.get(k)
+        key.append(None if value is None else bisect_right(cuts, value))
+    if similarity == "knn" or raw_numerics:
+        key.extend((k, info.get(k)) for k in RAW_NUMERIC_KEYS)
+    return tuple(key)
+
+
+def needs_raw_numerics(kwargs):
+    return kwargs.get("percentiles") is not None or kwargs.get("risk") is not None
+
+
+class LRUCache:
+    """Bounded mapping with least-recently-used eviction and hit/miss/eviction counters."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = compute()  # outside the lock; a racing duplicate compute is harmless
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+
+class RoadmapCache:
+    """Structured roadmaps and rendered Markdown, memoized separately per dataset version.
+
+    Returned roadmaps are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, markdown_maxsize=None):
+        self.roadmaps = LRUCache(maxsize)
+        self.markdown = LRUCache(markdown_maxsize or maxsize)
+
+    def roadmap(self, info, df, version, similarity="exact", **kwargs):
+        key = (version, profile_key(info, similarity, needs_raw_numerics(kwargs)))
+        return self.roadmaps.get_or_compute(
+            key, lambda: generate_structured_roadmap(info, df, similarity=similarity, **kwargs))
+
+    def roadmap_markdown(self, name, info, df, version, similarity="exact", **kwargs):
+        # The Markdown also prints the raw profile, the name and today's date.
+        shown = tuple(str(info.get(k)) for k in MARKDOWN_PROFILE_KEYS)
+        key = (version, profile_key(info, similarity, needs_raw_numerics(kwargs)), name, date.today().isoformat(), shown)
+        return self.markdown.get_or_compute(
+            key, lambda: roadmap_to_markdown(name, info, self.roadmap(info, df, version, similarity, **kwargs)))
+
+    def stats(self):
+        return {"roadmaps": self.roadmaps.stats(), "markdown": self.markdown.stats()}
+
+    def clear(self):
+        self.roadmaps.clear()
+        self.markdown.clear()
+
+
+# process-wide instance shared by every Streamlit session
+ROADMAP_CACHE = RoadmapCache()
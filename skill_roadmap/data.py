@@ -0,0 +1,406 @@
+"""Dataset loading (typed schema + binary sidecar) and the precomputed cohort index."""
+import hashlib
+import io
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .instrument import traced
+
+DATA_PATH = "student_performance_extended.csv"  # Replace with your dataset path
+CACHE_DIR = ".data_cache"
+# bump when the stored column layout changes, so stale sidecars are rebuilt
+SIDECAR_FORMAT = 3
+COLUMN_ALIASES = {"GPA": "gpa"}
+SCHEMA = {
+    "student_id": "int", "year": "category", "branch": "category", "gpa": "float",
+    "study_hours": "int", "failures": "int", "hostel": "category", "sleep_hours": "int",
+    "family_support": "category", "interest": "category", "budget_level": "category",
+    "skill_level": "category", "stress_level": "category", "communication_level": "category",
+    "confusion_level": "category",
+}
+# selectbox name -> (dataset column, fallback when the column is missing)
+OPTION_COLUMNS = {
+    "years": ("year", [1, 2, 3, 4]),
+    "branches": ("branch", ["CSE", "ECE", "EEE", "IT", "Mechanical"]),
+    "interests": ("interest", ["AI/ML", "Data Analysis", "Web Development"]),
+    "budgets": ("budget_level", ["Low", "Medium", "High"]),
+    "skill_levels": ("skill_level", ["Beginner", "Intermediate"]),
+    "stress_levels": ("stress_level", ["Low", "Medium", "High"]),
+    "conf_levels": ("confusion_level", ["Low", "Medium", "High"]),
+    "comm_levels": ("communication_level", ["Poor", "Average", "Good"]),
+}
+# options whose fallback list is their natural order (Low < Medium < High), not alphabetical
+ORDINAL_OPTIONS = {"budgets", "skill_levels", "stress_levels", "conf_levels", "comm_levels"}
+
+
+def safe_unique(df, col, fallback):
+    return sorted(df[col].dropna().unique()) if col in df.columns else fallback
+
+
+def option_values(name, values):
+    """Sorted selectbox values; ordinal options follow their fallback order, unknown values last."""
+    if name not in ORDINAL_OPTIONS:
+        return sorted(values)
+    rank = {v: i for i, v in enumerate(OPTION_COLUMNS[name][1])}
+    return sorted(values, key=lambda v: (rank.get(v, len(rank)), str(v)))
+
+
+def source_signature(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def apply_schema(df):
+    """Rename aliases, store categoricals as small-int codes and downcast integer columns.
+
+    Floats stay float64: a float32 GPA no longer equals the value typed in the form
+    (percentile ties) and prints as 7.019999980926514.
+    """
+    df = df.rename(columns=COLUMN_ALIASES)
+    for col in df.columns:
+        kind = SCHEMA.get(col)
+        if kind == "category":
+            df[col] = df[col].astype("category")
+        elif kind == "int":
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif kind == "float":
+            df[col] = pd.to_numeric(df[col]).astype(np.float64)
+    return df
+
+
+def write_sidecar(df, cache_dir, signature):
+    """Write the columns to a new directory under `cache_dir`, then point meta.json at it.
+
+    Column files are never rewritten once published: other processes, and
+    refresh.ColumnBuffer, may still have them memory-mapped. The directory is
+    written under a temporary name and renamed into place (as in shared.publish_dataset);
+    older ones are pruned, keeping the one meta.json pointed at until now.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    name = f"columns-{signature['size']}-{signature['mtime_ns']}"
+    tmp = os.path.join(cache_dir, f".{name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    columns = []
+    for col in df.columns:
+        fname = f"{len(columns)}.npy"
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            np.save(os.path.join(tmp, fname), df[col].cat.codes.to_numpy())
+            columns.append({"name": col, "file": fname, "categories": df[col].cat.categories.tolist()})
+        else:
+            np.save(os.path.join(tmp, fname), df[col].to_numpy())
+            columns.append({"name": col, "file": fname})
+    try:
+        os.replace(tmp, os.path.join(cache_dir, name))
+    except OSError:  # another process published the same version first
+        shutil.rmtree(tmp, ignore_errors=True)
+    previous = read_meta(cache_dir).get("dir")
+    write_meta(cache_dir, dict(signature, format=SIDECAR_FORMAT, dir=name, columns=columns))
+    for entry in os.listdir(cache_dir):
+        if entry.startswith("columns-") and entry not in (name, previous):
+            shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
+
+
+def read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "meta.json")) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_meta(cache_dir, meta):
+    tmp = os.path.join(cache_dir, "meta.json.tmp")
+    with open(tmp, "w") as fh:
+        json.dump(meta, fh, default=lambda v: v.item() if hasattr(v, "item") else str(v))
+    os.replace(tmp, os.path.join(cache_dir, "meta.json"))
+
+
+def read_sidecar(cache_dir, path, signature):
+    """Memory-map the cached columns if they still describe the CSV at `path`, else return None."""
+    meta = read_meta(cache_dir)
+    if meta.get("format") != SIDECAR_FORMAT or meta.get("size") != signature["size"]:
+        return None
+    if meta.get("mtime_ns") != signature["mtime_ns"]:
+        # touched but maybe unchanged: fall back to the content hash
+        if meta.get("sha256") != file_hash(path):
+            return None
+        meta["mtime_ns"] = signature["mtime_ns"]
+        write_meta(cache_dir, meta)
+    cols = {}
+    for c in meta["columns"]:
+        try:
+            arr = np.load(os.path.join(cache_dir, meta["dir"], c["file"]), mmap_mode="r")
+        except OSError:  # pruned by a newer write_sidecar meanwhile
+            return None
+        if "categories" in c:
+            cols[c["name"]] = pd.Categorical.from_codes(arr, c["categories"])
+        else:
+            cols[c["name"]] = arr
+    return pd.DataFrame(cols, copy=False)
+
+
+def build_options(df):
+    """Selectbox option lists, read off the category dictionaries (no per-widget unique/sort)."""
+    options = {}
+    for name, (col, fallback) in OPTION_COLUMNS.items():
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+            options[name] = option_values(name, df[col].cat.categories.tolist())
+        else:
+            options[name] = option_values(name, safe_unique(df, col, fallback))
+    return options
+
+
+def dataset_version(path=DATA_PATH):
+    """Cheap token that changes whenever the CSV does; used to key downstream caches."""
+    signature = source_signature(path)
+    return f"{signature['size']}-{signature['mtime_ns']}"
+
+
+def load_typed_frame(path, cache_dir, signature, whole_lines=False):
+    """Typed frame of exactly the CSV's first signature["size"] bytes, and how many bytes it covers.
+
+    Rows appended after the stat are left for the next version. With `whole_lines`
+    a half-written last line is left out too (refresh.DatasetStore reads it once complete).
+    """
+    with open(path, "rb") as fh:
+        fh.seek(max(0, signature["size"] - 1))
+        ends_line = fh.read(1) == b"\n"
+    df = read_sidecar(cache_dir, path, signature) if ends_line or not whole_lines else None
+    if df is not None:
+        return df, signature["size"]
+    with open(path, "rb") as fh:
+        data = fh.read(signature["size"])
+    end = data.rfind(b"\n") + 1 if whole_lines else len(data)
+    df = apply_schema(pd.read_csv(io.BytesIO(data[:end])))
+    if end == len(data):
+        try:
+            write_sidecar(df, cache_dir, dict(signature, sha256=hashlib.sha256(data).hexdigest()))
+        except OSError:
+            pass  # read-only deploys just skip the sidecar
+    return df, end
+
+
+@traced()
+def load_typed_dataset(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Typed, compact frame + selectbox options; reuses the binary sidecar when it is still fresh."""
+    df, _ = load_typed_frame(path, cache_dir, source_signature(path))
+    return df, build_options(df)
+
+
+def normalize_yes_no(x):
+    if isinstance(x, str):
+        x = x.strip().lower()
+        if x in ("yes", "y", "true", "1", "hostel"):
+            return "Yes"
+    return "No"
+
+
+# roadmap profile key -> dataset column, where the two differ
+PROFILE_COLUMNS = {"budget": "budget_level", "communication": "communication_level"}
+PROFILE_KEYS = ["year", "branch", "interest", "skill_level", "budget", "hostel", "study_hours", "gpa",
+                "sleep_hours", "failures", "stress_level", "confusion_level", "communication", "family_support"]
+
+
+def row_to_profile(row):
+    """Map a dataset-shaped row (dict/Series) to the `info` dict the roadmap functions expect."""
+    info = {}
+    for key in PROFILE_KEYS:
+        col = PROFILE_COLUMNS.get(key, key)
+        value = row.get(col, row.get(key))
+        if value is not None and value == value:  # drop NaN
+            info[key] = value.item() if hasattr(value, "item") else value
+        else:
+            info[key] = None
+    info["hostel"] = normalize_yes_no(info["hostel"])
+    return info
+
+
+def profiles_frame(df):
+    """Vectorized row_to_profile: a frame with the profile keys as columns."""
+    frame = df.rename(columns={col: key for key, col in PROFILE_COLUMNS.items()})
+    frame = frame.reindex(columns=PROFILE_KEYS)
+    frame["hostel"] = frame["hostel"].astype(object).map(normalize_yes_no)
+    return frame
+
+
+COHORT_KEYS = ["year", "branch", "interest", "skill_level"]
+COHORT_STATS = ["gpa", "study_hours"]
+# a cohort smaller than this is widened by dropping these keys, one at a time
+MIN_SIMILAR = 5
+BACKOFF_DROP = ["skill_level", "interest", "year"]
+
+
+def build_cohort_index(df):
+    """Group rows once: (year, branch, interest, skill_level) -> count, stat sums and row positions."""
+    keys = [c for c in COHORT_KEYS if c in df.columns]
+    stats = [c for c in COHORT_STATS if c in df.columns]
+    cohorts = {}
+    if not keys:
+        return {"keys": keys, "stats": stats, "cohorts": cohorts}
+    grouped = df.reset_index(drop=True).groupby(keys, sort=False, dropna=True, observed=True)
+    sums = grouped[stats].sum() if stats else None
+    counts = grouped[stats].count() if stats else None
+    for label, rows in grouped.indices.items():
+        cohorts[label if len(keys) > 1 else (label,)] = {
+            "count": len(rows),
+            "rows": rows,
+            "sums": {c: float(sums.at[label, c]) for c in stats},
+            "counts": {c: int(counts.at[label, c]) for c in stats},
+        }
+    return {"keys": keys, "stats": stats, "cohorts": cohorts}
+
+
+def extend_cohort_index(index, delta, offset):
+    """New index = `index` plus `delta` (an index over rows appended at position `offset`).
+
+    Untouched cohorts are shared with the old index, so the cost is proportional to
+    the cohorts the new rows land in; readers of the old index are never disturbed.
+    """
+    cohorts = dict(index["cohorts"])
+    for key, add in delta["cohorts"].items():
+        old = cohorts.get(key)
+        rows = add["rows"] + offset
+        if old is None:
+            cohorts[key] = dict(add, rows=rows)
+            continue
+        cohorts[key] = {
+            "count": old["count"] + add["count"],
+            "rows": np.concatenate([old["rows"], rows]),
+            "sums": {c: old["sums"][c] + add["sums"].get(c, 0.0) for c in old["sums"]},
+            "counts": {c: old["counts"][c] + add["counts"].get(c, 0) for c in old["counts"]},
+        }
+    return {"keys": index["keys"], "stats": index["stats"], "cohorts": cohorts}
+
+
+def match_cohorts(index, info):
+    """Cohorts matching the profile; keys missing from info (or None) match everything, like the old filter."""
+    wanted = [(i, info[k]) for i, k in enumerate(index["keys"]) if k in info and info[k] is not None]
+    if len(wanted) == len(index["keys"]):
+        key = tuple(v for _, v in wanted)
+        return [index["cohorts"][key]] if key in index["cohorts"] else []
+    return [c for key, c in index["cohorts"].items() if all(key[i] == v for i, v in wanted)]
+
+
+@traced()
+def lookup_cohort(index, info):
+    """Count and stat means for the profile's cohort, straight from the index (no frame scan)."""
+    matched = match_cohorts(index, info)
+    count = sum(c["count"] for c in matched)
+    means = {}
+    for col in index["stats"]:
+        n = sum(c["counts"][col] for c in matched)
+        means[col] = sum(c["sums"][col] for c in matched) / n if n else float("nan")
+    return {"count": count, "means": means}
+
+
+def rollup_cohort_index(index, keys):
+    """`index` rolled up to a subset of its keys: counts and sums added, row positions concatenated."""
+    positions = [index["keys"].index(k) for k in keys]
+    with_rows = all("rows" in c for c in index["cohorts"].values())
+    cohorts, parts = {}, {}
+    for key, cohort in index["cohorts"].items():
+        sub = tuple(key[i] for i in positions)
+        agg = cohorts.get(sub)
+        if agg is None:
+            agg = cohorts[sub] = {"count": 0, "sums": dict.fromkeys(index["stats"], 0.0),
+                                  "counts": dict.fromkeys(index["stats"], 0)}
+        agg["count"] += cohort["count"]
+        for c in index["stats"]:
+            agg["sums"][c] += cohort["sums"][c]
+            agg["counts"][c] += cohort["counts"][c]
+        if with_rows:
+            parts.setdefault(sub, []).append(cohort["rows"])
+    for sub, rows in parts.items():
+        cohorts[sub]["rows"] = rows[0] if len(rows) == 1 else np.concatenate(rows)
+    return {"keys": list(keys), "stats": index["stats"], "cohorts": cohorts}
+
+
+def backoff_keys(keys):
+    """Key lists of the widened levels, e.g. (year, branch, interest), then (year, branch)."""
+    levels, keys = [], list(keys)
+    for drop in BACKOFF_DROP:
+        if drop in keys and len(keys) > 1:
+            keys = [k for k in keys if k != drop]
+            levels.append(keys)
+    return levels
+
+
+def build_backoff_index(index):
+    """The cohort index rolled up to every backoff level; level 0 is `index` itself.
+
+    Built from the cohort index alone (streamed and shared indexes too), so widening a
+    match never touches the frame. Every level is index-shaped, so lookup_cohort and
+    similar_rows read any of them; levels carry row positions when `index` does.
+    Build it once per dataset version and pass it on (or use index_backoff).
+    """
+    return {"levels": [index] + [rollup_cohort_index(index, keys) for keys in backoff_keys(index["keys"])]}
+
+
+def extend_backoff_index(backoff, index, delta, offset):
+    """New backoff index for `index` = extend_cohort_index(old level 0, delta, offset).
+
+    Each widened level is extended with `delta` rolled up to its keys, so, as for the
+    cohort index, the cost is proportional to the cohorts the appended rows land in.
+    """
+    return {"levels": [index] + [extend_cohort_index(level, rollup_cohort_index(delta, level["keys"]), offset)
+                                 for level in backoff["levels"][1:]]}
+
+
+def index_backoff(index):
+    """build_backoff_index(index), built on first use and kept on the index dict."""
+    backoff = index.get("backoff")
+    if backoff is None:
+        backoff = index["backoff"] = build_backoff_index(index)
+    return backoff
+
+
+@traced()
+def backoff_lookup(backoff, info, min_count=MIN_SIMILAR):
+    """lookup_cohort at the narrowest level with at least `min_count` students.
+
+    Adds "level" (0 = exact cohort) and its "keys"; when no level is large enough,
+    the exact cohort is returned.
+    """
+    for level, index in enumerate(backoff["levels"]):
+        sim = lookup_cohort(index, info)
+        if sim["count"] >= min_count:
+            return dict(sim, level=level, keys=index["keys"])
+    exact = backoff["levels"][0]
+    return dict(lookup_cohort(exact, info), level=0, keys=exact["keys"])
+
+
+def similar_rows(index, info):
+    """Row positions of the profile's cohort: a view into the index when a single cohort matches.
+
+    None for indexes without row positions (streamed datasets).
+    """
+    matched = match_cohorts(index, info)
+    if any("rows" not in c for c in matched):
+        return None
+    if len(matched) == 1:
+        return matched[0]["rows"]
+    return np.sort(np.concatenate([c["rows"] for c in matched])) if matched else np.array([], dtype=np.intp)
+
+
+@traced()
+def get_similar_students(df, info, index=None):
+    """Simple similarity filter (no ML): same year + branch + interest + skill_level if possible."""
+    index = index if index is not None else build_cohort_index(df)
+    rows = similar_rows(index, info)
+    f = df.iloc[rows if rows is not None else []]  # one gather; assign returns a new frame, never writes into df
+    if "hostel" in f.columns:
+        f = f.assign(hostel=f["hostel"].apply(normalize_yes_no))
+    return f
@@ -0,0 +1,155 @@
+"""Roadmap generation and Markdown export (no Streamlit dependency)."""
+import io
+from datetime import date
+
+from .data import MIN_SIMILAR, backoff_lookup, build_cohort_index, index_backoff, similar_rows
+from .instrument import traced
+from .percentiles import percentile_lookup, standing_lines
+from .risk import assess_risk
+from .rules import evaluate_rules
+from .similarity import build_knn_index, knn_lookup
+
+COHORT_LABELS = {"skill_level": "skill"}
+
+
+def build_week_plan(interest, skill_level, budget_level):
+    """A structured 4-week roadmap (generic but clean)."""
+    free_note = "Use free resources (YouTube/NPTEL/free Coursera audits)." if budget_level=="Low" else "Consider 1 paid course + mentorship for speed."
+    if skill_level=="Beginner":
+        project = "Mini project: build a basic end-to-end demo"
+        depth = "Focus on fundamentals + consistent practice"
+    else:
+        project = "Project: build a portfolio-grade real-world application"
+        depth = "Focus on advanced concepts + real datasets + deployment"
+    return [
+        {"title":"Week 1 — Foundation","bullets":[f"{depth} in **{interest}** (core concepts).","Set up tools (GitHub, editor, notes).","Daily practice: 45–60 mins.", free_note]},
+        {"title":"Week 2 — Skill Building","bullets":["Solve 10–15 practice problems / exercises.","Start a structured course + take notes.","Build 1 small component (feature/module) daily."]},
+        {"title":"Week 3 — Projects & Proof","bullets":[project,"Add README + screenshots + clear steps.","Push code daily to GitHub (commit streak)."]},
+        {"title":"Week 4 — Career Readiness","bullets":["Resume: add project + skills + links.","Mock interview / presentations (2 sessions).","Polish project + deploy (if possible).","Plan next month based on gaps."]},
+    ]
+
+
+@traced()
+def generate_structured_roadmap(info, df, index=None, sections=None, similarity="exact", knn=None, percentiles=None,
+                                risk=None, risk_score=None, backoff=None):
+    """Return a rich roadmap object (not just flat strings).
+
+    `sections` takes precomputed rule output (see rules.evaluate_rules_frame) so
+    batch callers can evaluate the rule table for a whole chunk at once.
+    `similarity="knn"` uses the nearest-neighbour index (similarity.build_knn_index)
+    instead of the exact year/branch/interest/skill cohort.
+    `percentiles` (percentiles.build_percentile_index) adds where the student
+    stands on GPA, study and sleep hours, in the cohort and dataset-wide.
+    `risk` (risk.build_risk_index) adds the model's academic-risk score, compared
+    with the similar students; batch callers pass `risk_score` precomputed per chunk.
+    Exact cohorts under MIN_SIMILAR students widen step by step (data.BACKOFF_DROP)
+    using `backoff` (data.build_backoff_index, built per dataset version); without
+    it the one cached on `index` is used (data.index_backoff), built on first use.
+    """
+    sections = sections if sections is not None else evaluate_rules(info)
+    if similarity == "knn":
+        knn = knn if knn is not None else build_knn_index(df)
+        sim = knn_lookup(knn, info)
+        basis = f"the **{sim['count']} most similar students** (nearest by year/branch/interest/skill, GPA, study/sleep hours, failures and stress)"
+    else:
+        index = index if index is not None else build_cohort_index(df)
+        backoff = backoff if backoff is not None else index_backoff(index)
+        sim = backoff_lookup(backoff, info)
+        same = "/".join(COHORT_LABELS.get(k, k) for k in sim["keys"])
+        dropped = "/".join(COHORT_LABELS.get(k, k) for k in index["keys"] if k not in sim["keys"])
+        basis = f"**{sim['count']} similar students** (same {same}" + (
+            f"; widened, too few also shared {dropped})" if dropped else ")")
+    sim_note = None
+    if sim["count"] >= MIN_SIMILAR:
+        avg_gpa = sim["means"].get("gpa")
+        avg_study = sim["means"].get("study_hours")
+        if avg_gpa is not None and avg_study is not None:
+            sim_note = f"Based on {basis}, average GPA is **{avg_gpa:.2f}** and average study hours is **{avg_study:.1f}/day**."
+        else:
+            sim_note = f"Not enough similar-student rows for strong stats (found {sim['count']}). Using rule-based roadmap."
+    else:
+        sim_note = f"Not enough similar-student rows for strong stats (found {sim['count']}). Using rule-based roadmap."
+
+    week_plan = build_week_plan(info["interest"], info["skill_level"], info["budget"])
+
+    # Resources by interest
+    interest_lower = str(info["interest"]).lower()
+    if "data" in interest_lower or "ml" in interest_lower or "ai" in interest_lower:
+        resources = ["NPTEL / YouTube: Python + ML basics","Kaggle: datasets + notebooks","GitHub: portfolio + README","LeetCode/HackerRank: fundamentals (optional)"]
+        projects = ["Student performance prediction / analysis dashboard","Mini recommender system","Simple ML model + Streamlit deployment"]
+    elif "web" in interest_lower:
+        resources = ["MDN Web Docs (HTML/CSS/JS)","Frontend practice: small clones","GitHub Pages / Vercel for deployment"]
+        projects = ["Portfolio website","To-do app + local storage","Mini full-stack CRUD app"]
+    else:
+        resources = ["YouTube + NPTEL fundamentals","One structured course (beginner → intermediate)","Build 2–3 projects + document well"]
+        projects = ["1 mini project","1 intermediate project","1 portfolio-grade project"]
+
+    roadmap = {"similar_note": sim_note,"goals": sections["goals"],"risks": sections["risks"],"habits": sections["habits"],"steps": sections["steps"],"week_plan": week_plan,"resources": resources,"projects": projects}
+    if similarity != "knn":
+        roadmap["similar_level"] = {"level": sim["level"], "keys": list(sim["keys"]), "count": sim["count"]}
+    if risk is not None:
+        # the widened cohort when the exact one was too small; its rows are stored with the backoff level
+        rows = sim.get("rows") if similarity == "knn" else similar_rows(backoff["levels"][sim["level"]], info)
+        assessment = assess_risk(risk, info, rows, risk_score)
+        # a relative score from a model of the current profile, not the probability of a future outcome
+        if assessment["observed"]:
+            note = f"Academic risk: **{assessment['band']}** ({assessment['observed']}"
+        else:
+            note = f"Academic risk score: **{assessment['band']}** ({assessment['score']:.2f} on a 0–1 scale"
+        if assessment["cohort_mean"] is not None:
+            note += f"; similar students average {assessment['cohort_mean']:.2f}"
+        roadmap["risk"] = assessment
+        roadmap["risks"] = [note + ")."] + list(roadmap["risks"])
+    if percentiles is not None:
+        standing = percentile_lookup(percentiles, info)
+        roadmap["standing"] = standing
+        roadmap["standing_notes"] = standing_lines(standing, approximate=percentiles["mode"] == "sketch")
+    return roadmap
+
+
+MARKDOWN_PROFILE_KEYS = ["year", "branch", "interest", "skill_level", "budget", "hostel", "study_hours",
+                         "gpa", "stress_level", "confusion_level", "communication", "family_support"]
+
+
+# (heading, roadmap key) for the bullet-list sections, in document order
+LIST_SECTIONS = [("Risks to Watch", "risks"), ("Daily Habits", "habits"), ("Action Steps", "steps"),
+                 ("Suggested Projects", "projects"), ("Resources", "resources")]
+
+
+def write_roadmap_markdown(out, name, info, roadmap):
+    """Stream the Markdown document to `out` (anything with .write), line by line."""
+    def s(x): return str(x) if x is not None else ""
+    w = out.write
+    w(f"# Personalized Roadmap for {s(name)}\n**Generated on:** {date.today()}\n\n")
+    w("## Profile\n")
+    for k in MARKDOWN_PROFILE_KEYS:
+        w(f"- **{k.replace('_',' ').title()}**: {s(info.get(k))}\n")
+    w("\n## Data Insight\n")
+    w(f"{s(roadmap.get('similar_note',''))}\n\n")
+    if roadmap.get("standing_notes"):
+        w("## Where You Stand\n")
+        for n in roadmap["standing_notes"]: w(f"- {s(n)}\n")
+        w("\n")
+    w("## Goals\n")
+    for g in roadmap.get("goals", []): w(f"- {s(g)}\n")
+    w("\n")
+    for section, key in LIST_SECTIONS:
+        items = roadmap.get(key, [])
+        if items:
+            w(f"## {section}\n")
+            for i in items: w(f"- {s(i)}\n")
+            w("\n")
+    # 4-Week plan
+    w("## 4-Week Plan\n")
+    for wk in roadmap.get("week_plan", []):
+        w(f"### {s(wk.get('title',''))}\n")
+        for b in wk.get("bullets", []):
+            w(f"- {s(b)}\n")
+        w("\n")
+
+
+@traced()
+def roadmap_to_markdown(name, info, roadmap):
+    out = io.StringIO()
+    write_roadmap_markdown(out, name, info, roadmap)
+    return out.getvalue()[:-1]  # the document without its final newline, as before
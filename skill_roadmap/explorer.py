@@ -0,0 +1,60 @@
+"""Server-side filtering, sorting and pagination for the dataset explorer.
+
+Filters and sort keys work on row positions; only the requested page (and the
+requested columns) is ever materialized as a DataFrame.
+"""
+import numpy as np
+import pandas as pd
+
+from .instrument import traced
+
+FILTER_COLUMNS = ["branch", "year", "interest", "skill_level"]
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def column_values(df, col):
+    """Filter choices for a column: the category dictionary when there is one."""
+    if isinstance(df[col].dtype, pd.CategoricalDtype):
+        return sorted(df[col].cat.categories.tolist())
+    return sorted(df[col].dropna().unique().tolist())
+
+
+def filter_positions(df, filters):
+    """Row positions matching every non-empty {column: [allowed values]} filter."""
+    mask = np.ones(len(df), dtype=bool)
+    for col, allowed in filters.items():
+        if not allowed or col not in df.columns:
+            continue
+        mask &= df[col].isin(allowed).to_numpy(dtype=bool)
+    return np.flatnonzero(mask)
+
+
+def sort_positions(df, positions, sort_by=None, ascending=True):
+    if not sort_by or sort_by not in df.columns or not len(positions):
+        return positions
+    column = df[sort_by]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # rank of each category; appended rows (skill_roadmap.refresh) can add categories out of order
+        ranks = np.argsort(np.argsort(np.asarray(column.cat.categories, dtype=object)))
+        codes = column.cat.codes.to_numpy()
+        values = np.where(codes >= 0, ranks[codes], -1)[positions] if len(ranks) else codes[positions]
+    else:
+        values = column.to_numpy()[positions]
+    order = np.argsort(values, kind="stable")
+    return positions[order if ascending else order[::-1]]
+
+
+@traced()
+def query_page(df, filters=None, columns=None, sort_by=None, ascending=True, page=1, page_size=PAGE_SIZES[0]):
+    """One page of the (filtered, sorted, projected) dataset.
+
+    Returns (page_frame, total_matching_rows, page_count); `page` is 1-based and clamped.
+    """
+    positions = filter_positions(df, filters or {})
+    total = len(positions)
+    page_count = max(1, -(-total // page_size))
+    page = min(max(1, page), page_count)
+    positions = sort_positions(df, positions, sort_by, ascending)
+    window = positions[(page - 1) * page_size: page * page_size]
+    columns = [c for c in (columns or df.columns) if c in df.columns]
+    return df.iloc[window][columns], total, page_count
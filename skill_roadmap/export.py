@@ -0,0 +1,230 @@
+"""Bulk roadmap export: Markdown, JSON and HTML documents streamed into a ZIP.
+
+Profiles come from a filtered slice of the dataset or from an uploaded CSV
+and are processed one chunk at a time: one vectorized rule pass and one risk
+scoring call per chunk, the same as skill_roadmap.batch. Each document is
+written straight into its ZIP entry, and iter_zip hands back the compressed
+bytes after every document. Memory therefore stays at one chunk plus one
+document, and the first bytes are ready as soon as the first roadmap is.
+
+    python -m skill_roadmap.export --filter branch=CSE --filter year=3 --out cse-3.zip
+    python -m skill_roadmap.export --input intake.csv --formats md,html --out intake.zip
+"""
+import argparse
+import html
+import io
+import json
+import re
+import sys
+import zipfile
+from datetime import date
+
+import pandas as pd
+
+from .batch import profile_name
+from .data import (
+    COLUMN_ALIASES,
+    DATA_PATH,
+    build_backoff_index,
+    build_cohort_index,
+    load_typed_dataset,
+    profiles_frame,
+    row_to_profile,
+)
+from .engine import LIST_SECTIONS, MARKDOWN_PROFILE_KEYS, generate_structured_roadmap, write_roadmap_markdown
+from .explorer import filter_positions
+from .percentiles import build_percentile_index
+from .risk import build_risk_index, load_risk_model, score_frame
+from .rules import evaluate_rules_frame
+
+EXPORT_FORMATS = ("md", "json", "html")
+EXPORT_CHUNK_ROWS = 1000
+HTML_STYLE = ("body{font-family:system-ui,sans-serif;max-width:50rem;margin:2rem auto;padding:0 1rem;line-height:1.5}"
+              "h2{border-bottom:1px solid #ddd}")
+
+
+def dataset_chunks(df, filters=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Rows of `df` matching explorer-style {column: [values]} filters, a chunk at a time."""
+    positions = filter_positions(df, filters or {})
+    for start in range(0, len(positions), chunk_rows):
+        yield df.iloc[positions[start:start + chunk_rows]]
+
+
+def coerce_filters(df, filters):
+    """Match filter values to the column's own values by their text, e.g. "4" -> 4 for year.
+
+    Values with no match are kept as given, so they select nothing rather than
+    dropping the filter. Raises KeyError for a column `df` lacks.
+    """
+    out = {}
+    for column, wanted in filters.items():
+        if column not in df.columns:
+            raise KeyError(column)
+        text = {str(v) for v in wanted}
+        values = df[column].cat.categories if isinstance(df[column].dtype, pd.CategoricalDtype) else df[column]
+        out[column] = [v for v in pd.unique(values) if str(v) in text] or list(wanted)
+    return out
+
+
+def csv_chunks(source, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Rows of an uploaded profile CSV (path or file object), a chunk at a time."""
+    for chunk in pd.read_csv(source, chunksize=chunk_rows):
+        yield chunk.rename(columns=COLUMN_ALIASES)
+
+
+def iter_roadmaps(chunks, df, risk=None, **kwargs):
+    """(position, name, info, roadmap) for every profile row; kwargs go to generate_structured_roadmap."""
+    position = 0
+    for chunk in chunks:
+        profiles = profiles_frame(chunk)
+        sections = evaluate_rules_frame(profiles)
+        scores = score_frame(risk["artifact"], profiles) if risk is not None else [None] * len(chunk)
+        for offset, row in enumerate(chunk.to_dict("records")):
+            info = row_to_profile(row)
+            roadmap = generate_structured_roadmap(info, df, sections=sections[offset], risk=risk,
+                                                  risk_score=scores[offset], **kwargs)
+            yield position, profile_name(row, position), info, roadmap
+            position += 1
+
+
+def inline_html(text):
+    # escape, then the only Markdown the roadmap text uses: **bold**
+    return re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", html.escape(str(text) if text is not None else ""))
+
+
+def write_roadmap_html(out, name, info, roadmap):
+    """Stream a standalone HTML page with the same sections as the Markdown export."""
+    w = out.write
+    title = html.escape(f"Personalized Roadmap for {name}")
+    w(f'<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n<title>{title}</title>\n'
+      f"<style>{HTML_STYLE}</style>\n</head>\n<body>\n<h1>{title}</h1>\n"
+      f"<p><strong>Generated on:</strong> {date.today()}</p>\n")
+
+    def bullets(heading, items):
+        if items:
+            w(f"<h2>{heading}</h2>\n<ul>\n")
+            for item in items:
+                w(f"<li>{inline_html(item)}</li>\n")
+            w("</ul>\n")
+
+    w("<h2>Profile</h2>\n<ul>\n")
+    for k in MARKDOWN_PROFILE_KEYS:
+        w(f"<li><strong>{k.replace('_', ' ').title()}</strong>: {inline_html(info.get(k))}</li>\n")
+    w("</ul>\n")
+    w(f"<h2>Data Insight</h2>\n<p>{inline_html(roadmap.get('similar_note', ''))}</p>\n")
+    bullets("Where You Stand", roadmap.get("standing_notes"))
+    w("<h2>Goals</h2>\n<ul>\n")
+    for g in roadmap.get("goals", []):
+        w(f"<li>{inline_html(g)}</li>\n")
+    w("</ul>\n")
+    for section, key in LIST_SECTIONS:
+        bullets(section, roadmap.get(key))
+    w("<h2>4-Week Plan</h2>\n")
+    for week in roadmap.get("week_plan", []):
+        w(f"<h3>{inline_html(week.get('title', ''))}</h3>\n<ul>\n")
+        for b in week.get("bullets", []):
+            w(f"<li>{inline_html(b)}</li>\n")
+        w("</ul>\n")
+    w("</body>\n</html>\n")
+
+
+def write_roadmap_json(out, name, info, roadmap):
+    json.dump({"name": name, "profile": info, "roadmap": roadmap}, out, ensure_ascii=False, default=str, indent=2)
+    out.write("\n")
+
+
+WRITERS = {"md": write_roadmap_markdown, "json": write_roadmap_json, "html": write_roadmap_html}
+
+
+def entry_name(position, name, fmt):
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", name).strip("-").lower() or "student"
+    return f"{fmt}/{position + 1:06d}-{slug[:60]}.{fmt}"
+
+
+class _Spool(io.RawIOBase):
+    """Write-only, unseekable sink; zipfile then streams entries with data descriptors."""
+
+    def __init__(self):
+        self.parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.parts.append(bytes(b))
+        return len(b)
+
+    def drain(self):
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def iter_zip(roadmaps, formats=EXPORT_FORMATS):
+    """ZIP archive bytes for (position, name, info, roadmap) items, yielded after every document."""
+    formats = [f for f in EXPORT_FORMATS if f in formats]
+    sink = _Spool()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        for position, name, info, roadmap in roadmaps:
+            for fmt in formats:
+                with archive.open(entry_name(position, name, fmt), "w") as raw, \
+                        io.TextIOWrapper(raw, encoding="utf-8", newline="") as fh:
+                    WRITERS[fmt](fh, name, info, roadmap)
+            yield sink.drain()
+    yield sink.drain()  # central directory
+
+
+def write_zip(out, roadmaps, formats=EXPORT_FORMATS):
+    """Write the archive to a binary file object; returns the number of bytes written."""
+    size = 0
+    for part in iter_zip(roadmaps, formats):
+        out.write(part)
+        size += len(part)
+    return size
+
+
+def parse_filters(values):
+    filters = {}
+    for value in values:
+        column, sep, wanted = value.partition("=")
+        if not sep:
+            raise ValueError(f"expected column=value, got {value!r}")
+        filters.setdefault(column, []).extend(v.strip() for v in wanted.split(","))
+    return filters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export roadmaps for many students into one ZIP archive.")
+    parser.add_argument("--input", help="profile CSV to export (default: the reference dataset, see --filter)")
+    parser.add_argument("--filter", action="append", default=[], metavar="COLUMN=V1,V2",
+                        help="restrict dataset rows, e.g. branch=CSE or year=3,4 (repeatable)")
+    parser.add_argument("--formats", default="md,json,html", help="comma-separated subset of: md, json, html")
+    parser.add_argument("--data", default=DATA_PATH, help="reference dataset for the similar-student stats")
+    parser.add_argument("--out", default="roadmaps.zip")
+    args = parser.parse_args(argv)
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = set(formats) - set(EXPORT_FORMATS)
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+    try:
+        filters = parse_filters(args.filter)
+    except ValueError as exc:
+        parser.error(str(exc))
+    df, _ = load_typed_dataset(args.data)
+    try:
+        filters = coerce_filters(df, filters)  # CLI values are strings
+    except KeyError as exc:
+        parser.error(f"unknown column: {exc.args[0]}")
+    index = build_cohort_index(df)
+    artifact = load_risk_model()
+    risk = build_risk_index(artifact, df) if artifact is not None else None
+    chunks = csv_chunks(args.input) if args.input else dataset_chunks(df, filters)
+    roadmaps = iter_roadmaps(chunks, df, risk=risk, index=index, backoff=build_backoff_index(index),
+                             percentiles=build_percentile_index(df, index))
+    with open(args.out, "wb") as fh:
+        size = write_zip(fh, roadmaps, formats)
+    print(f"Wrote {args.out} ({size / 2**20:.1f} MiB)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Single-pass, fixed-memory ingestion for datasets larger than memory.
+
+Reads a student_performance_extended.csv-shaped file in chunks and keeps only
+what the app needs: cohort counts/sums (same shape as build_cohort_index,
+minus row positions), per-column category dictionaries for the selectboxes,
+quantile sketches for percentile standing, analytics cube cells and a
+bounded reservoir sample for the preview. Peak memory is one chunk plus those bounded aggregates, whatever
+the file size.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from .data import (
+    COHORT_KEYS,
+    COHORT_STATS,
+    COLUMN_ALIASES,
+    DATA_PATH,
+    OPTION_COLUMNS,
+    SCHEMA,
+    apply_schema,
+    option_values,
+)
+from .analytics import aggregate_cells, merge_cells
+from .instrument import traced
+from .percentiles import PERCENTILE_STATS, new_sketch_index, update_sketch_index
+
+STREAM_CHUNK_ROWS = 100_000
+SAMPLE_SIZE = 5_000
+# Switch the app to streaming ingestion above this file size.
+STREAM_THRESHOLD_BYTES = 512 * 2**20
+
+
+def data_mode(path=DATA_PATH):
+    """How the app loads `path`: "stream" (ROADMAP_INGEST=stream or above the threshold), "shared" or "typed"."""
+    if os.environ.get("ROADMAP_INGEST") == "stream" or os.path.getsize(path) > STREAM_THRESHOLD_BYTES:
+        return "stream"
+    return "shared" if os.environ.get("ROADMAP_DATA_MODE") == "shared" else "typed"
+
+
+def merge_cohorts(cohorts, chunk, keys, stats):
+    grouped = chunk.groupby(keys, sort=False, dropna=True, observed=True)
+    sizes = grouped.size()
+    sums = grouped[stats].sum() if stats else None
+    counts = grouped[stats].count() if stats else None
+    for label, size in sizes.items():
+        key = label if len(keys) > 1 else (label,)
+        key = tuple(k.item() if hasattr(k, "item") else k for k in key)
+        cohort = cohorts.get(key)
+        if cohort is None:
+            cohort = cohorts[key] = {"count": 0, "sums": dict.fromkeys(stats, 0.0), "counts": dict.fromkeys(stats, 0)}
+        cohort["count"] += int(size)
+        for c in stats:
+            cohort["sums"][c] += float(sums.at[label, c])
+            cohort["counts"][c] += int(counts.at[label, c])
+
+
+def reservoir_update(sample, chunk, seen, size, rng):
+    """Algorithm R over a whole chunk at once; `seen` rows came before this chunk."""
+    chunk = chunk.reset_index(drop=True)
+    fill = max(0, min(size - seen, len(chunk)))
+    if fill:
+        sample = pd.concat([sample, chunk.iloc[:fill]], ignore_index=True) if sample is not None else chunk.iloc[:fill].copy()
+    rest = chunk.iloc[fill:]
+    if len(rest):
+        positions = np.arange(seen + fill, seen + len(chunk))
+        slots = rng.integers(0, positions + 1)
+        take = slots < size
+        # a later row wins when two rows draw the same slot, exactly as the sequential algorithm
+        picked = pd.Series(np.flatnonzero(take), index=slots[take])
+        picked = picked[~picked.index.duplicated(keep="last")]
+        dst, src = picked.index.to_numpy(), picked.to_numpy()
+        if len(picked):
+            for col in sample.columns:
+                values = sample[col].to_numpy(copy=True)
+                values[dst] = rest[col].to_numpy()[src]
+                sample[col] = values
+    return sample
+
+
+@traced()
+def stream_dataset(path=DATA_PATH, chunk_rows=STREAM_CHUNK_ROWS, sample_size=SAMPLE_SIZE, seed=0):
+    """One pass over `path`; returns rows, cohort index, categories, options, percentile sketches, cube cells and sample."""
+    rng = np.random.default_rng(seed)
+    categorical = [c for c, kind in SCHEMA.items() if kind == "category"]
+    categories = {}
+    cohorts = {}
+    sample, rows = None, 0
+    keys = stats = percentiles = cube_cells = None
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        chunk = chunk.rename(columns=COLUMN_ALIASES)
+        if keys is None:
+            keys = [c for c in COHORT_KEYS if c in chunk.columns]
+            stats = [c for c in COHORT_STATS if c in chunk.columns]
+            percentiles = new_sketch_index(keys, [c for c in PERCENTILE_STATS if c in chunk.columns])
+        for col in categorical:
+            if col in chunk.columns:
+                categories.setdefault(col, set()).update(chunk[col].dropna().unique().tolist())
+        if keys:
+            merge_cohorts(cohorts, chunk, keys, stats)
+        update_sketch_index(percentiles, chunk)
+        cube_cells = merge_cells([cube_cells, aggregate_cells(chunk)])
+        sample = reservoir_update(sample, chunk, rows, sample_size, rng)
+        rows += len(chunk)
+
+    categories = {col: sorted(values) for col, values in categories.items()}
+    if sample is not None:
+        sample = apply_schema(sample)
+        for col, values in categories.items():
+            if col in sample.columns:
+                sample[col] = sample[col].cat.set_categories(values)
+    options = {name: option_values(name, categories.get(col, fallback))
+               for name, (col, fallback) in OPTION_COLUMNS.items()}
+    index = {"keys": keys or [], "stats": stats or [], "cohorts": cohorts}
+    return {"rows": rows, "index": index, "categories": categories, "options": options,
+            "percentiles": percentiles, "cube_cells": cube_cells, "sample": sample}
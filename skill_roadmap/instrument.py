@@ -0,0 +1,219 @@
+"""Opt-in timing spans, latency histograms and JSON-lines trace export.
+
+Tracing is scoped to a "run" (one Streamlit rerun or fragment rerun, one API
+request, ...). Outside a run every span/decorator is a single ContextVar lookup,
+so leaving instrumentation in the hot paths costs next to nothing.
+
+    run = begin_run(session_id, "rerun")
+    with span("load_data"):
+        ...
+    end_run(run)
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+TRACE_FILE = os.environ.get("ROADMAP_TRACE_FILE", "traces.jsonl")
+BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf")]
+MAX_SESSIONS = 256
+
+_current = ContextVar("roadmap_trace", default=None)
+_lock = threading.Lock()
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS_MS)
+        self.total = 0.0
+        self.n = 0
+
+    def add(self, ms):
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        self.total += ms
+        self.n += 1
+
+    def quantile(self, q):
+        """Upper bucket bound holding the q-quantile (an over-estimate, never an under-estimate)."""
+        if not self.n:
+            return None
+        target, seen = q * self.n, 0
+        for bound, count in zip(BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return BUCKETS_MS[-1]
+
+    def summary(self):
+        return {"count": self.n, "mean_ms": self.total / self.n if self.n else None,
+                "p50_ms": self.quantile(0.5), "p95_ms": self.quantile(0.95), "p99_ms": self.quantile(0.99)}
+
+
+PROCESS_START = time.perf_counter()  # first import of this module, close enough to process start
+STARTUP = {}                   # startup phase -> {"ms", "at_ms"}, first occurrence per process
+_startup_pending = []          # phases not yet written to TRACE_FILE
+SPANS = {}                     # span name -> Histogram (process-wide)
+RUNS = {}                      # run label -> Histogram of whole-run latency
+SESSIONS = OrderedDict()       # session id -> Histogram of its run latency
+COUNTERS = {}                  # cache call/miss counters: name -> {"calls": n, "misses": n}
+
+
+def begin_run(session_id, label="rerun"):
+    """Start collecting spans for this thread/context; returns a token for end_run."""
+    trace = {"session": session_id, "label": label, "start": time.time(), "t0": time.perf_counter(), "spans": []}
+    return trace, _current.set(trace)
+
+
+def end_run(run, export=True):
+    """Close a run: feed the histograms and append the trace as one JSON line."""
+    if run is None:
+        return None
+    trace, token = run
+    _current.reset(token)
+    total_ms = (time.perf_counter() - trace.pop("t0")) * 1000
+    trace["total_ms"] = round(total_ms, 3)
+    with _lock:
+        RUNS.setdefault(trace["label"], Histogram()).add(total_ms)
+        hist = SESSIONS.pop(trace["session"], None) or Histogram()
+        hist.add(total_ms)
+        SESSIONS[trace["session"]] = hist
+        while len(SESSIONS) > MAX_SESSIONS:
+            SESSIONS.popitem(last=False)
+        if export and TRACE_FILE:
+            with open(TRACE_FILE, "a", encoding="utf-8") as fh:
+                for name in _startup_pending:
+                    fh.write(json.dumps({"label": "startup", "phase": name, **STARTUP[name]}) + "\n")
+                _startup_pending.clear()
+                fh.write(json.dumps(trace) + "\n")
+    return trace
+
+
+@contextmanager
+def trace_run(session_id, label):
+    """A run as a context manager; nested inside an active run it is just a span."""
+    if _current.get() is not None:
+        with span(label):
+            yield
+        return
+    run = begin_run(session_id, label)
+    try:
+        yield
+    finally:
+        end_run(run)
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("trace", "name", "t0")
+
+    def __init__(self, trace, name):
+        self.trace, self.name = trace, name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter() - self.t0) * 1000
+        self.trace["spans"].append({"name": self.name, "ms": round(ms, 3),
+                                    "at_ms": round((self.t0 - self.trace["t0"]) * 1000, 3)})
+        with _lock:
+            SPANS.setdefault(self.name, Histogram()).add(ms)
+        return False
+
+
+def span(name):
+    trace = _current.get()
+    return _NO_SPAN if trace is None else _Span(trace, name)
+
+
+def traced(name=None):
+    """Decorator form of span(); a plain call when no run is active."""
+    def wrap(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            trace = _current.get()
+            if trace is None:
+                return fn(*args, **kwargs)
+            with _Span(trace, label):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def record_startup(name, ms):
+    """Keep the first timing of a one-off phase (imports, warm-up, first render).
+
+    Phases are appended to the trace file by the next exported run, so they stay opt-in too.
+    """
+    at_ms = (time.perf_counter() - PROCESS_START) * 1000
+    with _lock:
+        if name in STARTUP:
+            return False
+        STARTUP[name] = {"ms": round(ms, 3), "at_ms": round(at_ms, 3)}
+        _startup_pending.append(name)
+    return True
+
+
+@contextmanager
+def startup_phase(name):
+    """Time a block as a startup phase (and as a span, inside a run)."""
+    t0 = time.perf_counter()
+    try:
+        with span(name):
+            yield
+    finally:
+        record_startup(name, (time.perf_counter() - t0) * 1000)
+
+
+def count_call(name):
+    with _lock:
+        COUNTERS.setdefault(name, {"calls": 0, "misses": 0})["calls"] += 1
+
+
+def count_miss(name):
+    """Call from inside a cached function body: it only runs on a cache miss."""
+    with _lock:
+        COUNTERS.setdefault(name, {"calls": 0, "misses": 0})["misses"] += 1
+
+
+def cache_counters():
+    with _lock:
+        return {name: dict(c, hits=max(c["calls"] - c["misses"], 0)) for name, c in COUNTERS.items()}
+
+
+def snapshot(session_id=None):
+    """Everything the debug panel shows, as plain dicts."""
+    with _lock:
+        out = {
+            "spans": {name: h.summary() for name, h in SPANS.items()},
+            "runs": {label: h.summary() for label, h in RUNS.items()},
+            "sessions": len(SESSIONS),
+            "startup": {name: dict(phase) for name, phase in STARTUP.items()},
+        }
+        if session_id in SESSIONS:
+            h = SESSIONS[session_id]
+            out["session"] = dict(h.summary(), buckets=dict(zip([str(b) for b in BUCKETS_MS], h.counts)))
+    out["caches"] = cache_counters()
+    return out
@@ -0,0 +1,196 @@
+"""Where a student stands: percentile and rank for GPA, study and sleep hours.
+
+Exact mode presorts every stat once, dataset-wide and per (year, branch,
+interest, skill_level) cohort, so a lookup is two `searchsorted` calls per
+stat. Streamed datasets that are never held whole use QuantileSketch
+instead: fixed memory per cohort, approximate ranks.
+"""
+import numpy as np
+import pandas as pd
+
+PERCENTILE_STATS = ["gpa", "study_hours", "sleep_hours"]
+STAT_LABELS = {"gpa": "GPA", "study_hours": "Study hours", "sleep_hours": "Sleep hours"}
+SKETCH_K = 256
+
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch (KLL-style compactors, O(k log(n/k)) memory).
+
+    Level h holds sorted items of weight 2**h; a full level is halved by keeping
+    every other item (random offset) and promoting them one level up.
+    """
+
+    def __init__(self, k=SKETCH_K, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.n += other.n
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            level = np.sort(self.levels[h])
+            if len(level) > self.k:
+                odd = len(level) % 2
+                promoted = level[odd:][self._rng.integers(2)::2]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                level = level[:odd]
+            self.levels[h] = level
+            h += 1
+
+    def counts(self, value):
+        """Estimated (rows below value, rows at or below value)."""
+        below = sum(np.searchsorted(level, value, "left") << h for h, level in enumerate(self.levels))
+        at_or_below = sum(np.searchsorted(level, value, "right") << h for h, level in enumerate(self.levels))
+        return int(below), int(at_or_below)
+
+
+def _counts(source, value):
+    if isinstance(source, QuantileSketch):
+        return (*source.counts(value), source.n)
+    return int(np.searchsorted(source, value, "left")), int(np.searchsorted(source, value, "right")), len(source)
+
+
+def position(source, value):
+    """Mid-rank percentile (ties count half) and 1-based rank from the top, or None."""
+    if source is None or value is None or value != value:
+        return None
+    below, at_or_below, n = _counts(source, float(value))
+    if not n:
+        return None
+    return {"percentile": 100.0 * (below + at_or_below) / (2 * n), "rank": n - at_or_below + 1, "of": n}
+
+
+def presort_stats(df, cohort_index):
+    """Sorted stat arrays: dataset-wide, and grouped by cohort with per-cohort bounds.
+
+    Cohort i of cohort_index["cohorts"] is grouped[c][bounds[c][i]:bounds[c][i + 1]].
+    """
+    stats = [c for c in PERCENTILE_STATS if c in df.columns]
+    keys = list(cohort_index["cohorts"])
+    group = np.full(len(df), -1, dtype=np.int64)
+    for gid, key in enumerate(keys):
+        group[cohort_index["cohorts"][key]["rows"]] = gid
+    presorted = {"stats": stats, "overall": {}, "grouped": {}, "bounds": {}}
+    for c in stats:
+        values = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        presorted["overall"][c] = np.sort(values[valid])
+        # one lexsort by (cohort, value); every cohort is then a contiguous, sorted slice
+        ok = valid & (group >= 0)
+        g, v = group[ok], values[ok]
+        order = np.lexsort((v, g))
+        presorted["grouped"][c] = v[order]
+        presorted["bounds"][c] = np.searchsorted(g[order], np.arange(len(keys) + 1))
+    return presorted
+
+
+def percentile_index(cohort_index, presorted):
+    """Exact-mode index over presorted arrays; cohorts are slices (views), nothing is copied."""
+    stats = presorted["stats"]
+    cohorts = {}
+    for gid, key in enumerate(cohort_index["cohorts"]):
+        cohorts[key] = {c: presorted["grouped"][c][presorted["bounds"][c][gid]:presorted["bounds"][c][gid + 1]]
+                        for c in stats}
+    return {"mode": "exact", "keys": cohort_index["keys"], "stats": stats,
+            "overall": presorted["overall"], "cohorts": cohorts}
+
+
+def build_percentile_index(df, cohort_index):
+    """Presorted stat arrays, dataset-wide and per cohort of `cohort_index` (which must carry row positions)."""
+    return percentile_index(cohort_index, presort_stats(df, cohort_index))
+
+
+def _merge_sorted(sorted_values, values):
+    values = np.sort(values[~np.isnan(values)])
+    if not len(values):
+        return sorted_values
+    return np.insert(sorted_values, np.searchsorted(sorted_values, values), values)
+
+
+def extend_percentile_index(pindex, delta, delta_index):
+    """New exact-mode index = `pindex` plus the rows of frame `delta`, grouped by delta_index (its cohort index).
+
+    Like data.extend_cohort_index: untouched cohorts share their arrays with the old
+    index, and each touched cohort (and the dataset-wide array) merges in its sorted
+    new values instead of being re-sorted.
+    """
+    stats = pindex["stats"]
+    values = {c: pd.to_numeric(delta[c], errors="coerce").to_numpy(dtype=float) for c in stats}
+    cohorts = dict(pindex["cohorts"])
+    for key, add in delta_index["cohorts"].items():
+        old = cohorts.get(key, {})
+        cohorts[key] = {c: _merge_sorted(old.get(c, np.empty(0)), values[c][add["rows"]]) for c in stats}
+    return {"mode": "exact", "keys": pindex["keys"], "stats": stats,
+            "overall": {c: _merge_sorted(pindex["overall"][c], values[c]) for c in stats}, "cohorts": cohorts}
+
+
+def new_sketch_index(keys, stats, k=SKETCH_K):
+    return {"mode": "sketch", "keys": keys, "stats": stats, "k": k,
+            "overall": {c: QuantileSketch(k) for c in stats}, "cohorts": {}}
+
+
+def update_sketch_index(pindex, chunk):
+    """Fold one chunk of rows into a sketch-mode index (see ingest.stream_dataset)."""
+    stats, k = pindex["stats"], pindex["k"]
+    for c in stats:
+        pindex["overall"][c].update(pd.to_numeric(chunk[c], errors="coerce").to_numpy(dtype=float))
+    if not pindex["keys"]:
+        return
+    for label, rows in chunk.groupby(pindex["keys"], sort=False, dropna=True, observed=True).indices.items():
+        key = label if len(pindex["keys"]) > 1 else (label,)
+        key = tuple(x.item() if hasattr(x, "item") else x for x in key)
+        sketches = pindex["cohorts"].setdefault(key, {c: QuantileSketch(k) for c in stats})
+        for c in stats:
+            sketches[c].update(pd.to_numeric(chunk[c].iloc[rows], errors="coerce").to_numpy(dtype=float))
+
+
+def percentile_lookup(pindex, info):
+    """{stat: {"value", "cohort", "dataset"}} for the profile; positions are None when unavailable."""
+    key = tuple(info.get(k) for k in pindex["keys"])
+    cohort = pindex["cohorts"].get(key) if None not in key else None
+    return {
+        c: {
+            "value": info.get(c),
+            "cohort": position(cohort.get(c) if cohort else None, info.get(c)),
+            "dataset": position(pindex["overall"].get(c), info.get(c)),
+        }
+        for c in pindex["stats"]
+    }
+
+
+def ordinal(n):
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+def standing_lines(standing, approximate=False):
+    """One readable line per stat, e.g. "GPA 7.80: 64th percentile of your cohort (#12 of 35) · ..."."""
+    lines = []
+    for c, s in standing.items():
+        parts = []
+        for scope, label in (("cohort", "your cohort"), ("dataset", "all students")):
+            pos = s[scope]
+            if pos is not None:
+                parts.append(f"{ordinal(round(pos['percentile']))} percentile of {label} "
+                             f"({'~' if approximate else ''}#{pos['rank']:,} of {pos['of']:,})")
+        if parts:
+            lines.append(f"**{STAT_LABELS.get(c, c)} {s['value']:g}**: " + " · ".join(parts))
+    return lines
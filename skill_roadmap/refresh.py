@@ -0,0 +1,182 @@
+"""Incremental refresh for an append-only dataset CSV.
+
+DatasetStore keeps the typed columns in growable NumPy buffers. refresh()
+stats the file; when rows were appended it parses only the new tail, appends
+it to the buffers (amortized O(delta)), extends the cohort and backoff
+aggregates, merges the new values into the presorted percentile arrays and
+the analytics cells, scores only the new rows for risk and publishes a new
+snapshot with a new dataset version. Anything else (the file shrank, its
+first or last already-read bytes changed, or it was modified without
+growing) falls back to a full reload.
+"""
+import io
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .analytics import aggregate_cells, merge_cells
+from .data import (
+    CACHE_DIR,
+    DATA_PATH,
+    apply_schema,
+    build_backoff_index,
+    build_cohort_index,
+    build_options,
+    extend_backoff_index,
+    extend_cohort_index,
+    load_typed_frame,
+    source_signature,
+)
+from .instrument import traced
+from .percentiles import build_percentile_index, extend_percentile_index
+from .risk import build_risk_index, extend_risk_index, load_risk_model
+
+# the first and last this many bytes of what was read tell an append from a rewrite
+FINGERPRINT_BYTES = 4096
+
+
+class ColumnBuffer:
+    """Append-only column with capacity doubling; categoricals hold codes + a category list.
+
+    Starts as the loaded (possibly memory-mapped, read-only) array itself and is
+    only copied into a growable buffer on the first append. Wrapping the mapping
+    is safe because data.write_sidecar never rewrites a published column file.
+    """
+
+    def __init__(self, series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            self.categories = series.cat.categories.tolist()
+            self.lookup = {v: i for i, v in enumerate(self.categories)}
+            self.data = series.array.codes
+        else:
+            self.categories = self.lookup = None
+            self.data = np.asarray(series.to_numpy())
+        self.n = len(self.data)
+
+    def _reserve(self, extra, dtype):
+        dtype = np.result_type(self.data.dtype, dtype)
+        if self.n + extra <= len(self.data) and dtype == self.data.dtype:
+            return
+        grown = np.empty(max(16, 2 * (self.n + extra)), dtype=dtype)
+        grown[:self.n] = self.data[:self.n]
+        self.data = grown
+
+    def append(self, series):
+        if self.categories is not None:
+            series = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+            mapping = np.empty(len(series.cat.categories) + 1, dtype=np.int32)
+            mapping[-1] = -1  # code -1 (missing) indexes the last slot
+            for j, v in enumerate(series.cat.categories.tolist()):
+                code = self.lookup.get(v)
+                if code is None:
+                    code = self.lookup[v] = len(self.categories)
+                    self.categories.append(v)
+                mapping[j] = code
+            width = np.result_type(self.data.dtype, np.min_scalar_type(-len(self.categories)))
+            values = mapping[series.cat.codes.to_numpy()].astype(width, copy=False)
+        else:
+            values = np.asarray(series.to_numpy())
+        self._reserve(len(values), values.dtype)
+        self.data[self.n:self.n + len(values)] = values
+        self.n += len(values)
+
+    def view(self, n):
+        if self.categories is None:
+            return self.data[:n]
+        try:
+            return pd.Categorical.from_codes(self.data[:n], list(self.categories), validate=False)
+        except TypeError:  # pandas < 2.1 has no `validate`
+            return pd.Categorical.from_codes(self.data[:n], list(self.categories))
+
+
+class DatasetStore:
+    """Process-wide dataset that picks up appended CSV rows without a full rebuild."""
+
+    def __init__(self, path=DATA_PATH, cache_dir=CACHE_DIR):
+        self.path, self.cache_dir = path, cache_dir
+        self._lock = threading.Lock()
+        self.full_loads = self.refreshes = 0
+        self._full_load()
+
+    # ---------------- file bookkeeping ----------------
+    def _fingerprint(self, end):
+        with open(self.path, "rb") as fh:
+            head = fh.read(min(end, FINGERPRINT_BYTES))
+            fh.seek(max(0, end - FINGERPRINT_BYTES))
+            return head + fh.read(min(end, FINGERPRINT_BYTES))
+
+    def _full_load(self):
+        signature = source_signature(self.path)
+        # the offset is what was parsed: later appends and a half-written last line wait for refresh()
+        df, self.offset = load_typed_frame(self.path, self.cache_dir, signature, whole_lines=True)
+        with open(self.path, "rb") as fh:
+            self.header = pd.read_csv(io.BytesIO(fh.readline()), nrows=0).columns.tolist()
+        self.mtime_ns = signature["mtime_ns"]
+        self.fingerprint = self._fingerprint(self.offset)
+        self.buffers = {col: ColumnBuffer(df[col]) for col in df.columns}
+        self.n = len(df)
+        index = build_cohort_index(df)
+        artifact = load_risk_model()
+        self._publish(index, build_backoff_index(index), build_percentile_index(df, index),
+                      build_risk_index(artifact, df) if artifact is not None else None, aggregate_cells(df))
+        self.full_loads += 1
+
+    def _publish(self, index, backoff, percentiles, risk, cube_cells):
+        df = pd.DataFrame({col: buf.view(self.n) for col, buf in self.buffers.items()}, copy=False)
+        self.snapshot = {
+            "df": df,
+            "options": build_options(df),
+            "index": index,
+            "backoff": backoff,
+            "percentiles": percentiles,
+            "risk": risk,
+            "cube_cells": cube_cells,
+            "version": f"{self.offset}-{self.mtime_ns}",
+            "rows": self.n,
+        }
+
+    # ---------------- refresh ----------------
+    @traced()
+    def refresh(self):
+        """Current snapshot, after folding in any rows appended since the last call."""
+        with self._lock:
+            signature = source_signature(self.path)
+            if signature["size"] == self.offset and signature["mtime_ns"] == self.mtime_ns:
+                return self.snapshot
+            if signature["size"] < self.offset or self._fingerprint(self.offset) != self.fingerprint:
+                self._full_load()  # rewritten or truncated, not appended
+                return self.snapshot
+            if signature["size"] == self.offset:
+                # touched, or rewritten in place at the same size: reload (read_sidecar checks the content hash)
+                self._full_load()
+                return self.snapshot
+            self._append_tail(signature)
+            return self.snapshot
+
+    def _append_tail(self, signature):
+        with open(self.path, "rb") as fh:
+            fh.seek(self.offset)
+            tail = fh.read(signature["size"] - self.offset)
+        complete = tail[:tail.rfind(b"\n") + 1]  # leave a half-written last line for next time
+        if not complete.strip():
+            return
+        delta = apply_schema(pd.read_csv(io.BytesIO(complete), header=None, names=self.header))
+        missing = [c for c in self.buffers if c not in delta.columns]
+        if missing:
+            raise ValueError(f"appended rows lack columns: {', '.join(missing)}")
+        start = self.n
+        for col, buf in self.buffers.items():
+            buf.append(delta[col])
+        self.n += len(delta)
+        self.offset += len(complete)
+        self.mtime_ns = signature["mtime_ns"]
+        self.fingerprint = self._fingerprint(self.offset)
+        delta_index = build_cohort_index(delta)
+        old = self.snapshot
+        index = extend_cohort_index(old["index"], delta_index, start)
+        self._publish(index, extend_backoff_index(old["backoff"], index, delta_index, start),
+                      extend_percentile_index(old["percentiles"], delta, delta_index),
+                      extend_risk_index(old["risk"], delta) if old["risk"] is not None else None,
+                      merge_cells([old["cube_cells"], aggregate_cells(delta)]))
+        self.refreshes += 1
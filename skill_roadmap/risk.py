@@ -0,0 +1,113 @@
+"""Academic-risk scoring with a model trained offline (see skill_roadmap.train_risk).
+
+load_risk_model reads the versioned artifact once per process. score_frame
+encodes a whole frame of profiles with NumPy and runs a single predict_proba.
+build_risk_index scores the whole dataset once per version (and
+extend_risk_index only the rows appended since), and batch callers score
+whole chunks the same way. A UI request scores its one profile
+and reads its cohort's scores from that index. Artifacts are pickles: only
+load files you trained yourself.
+"""
+import functools
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .data import PROFILE_KEYS, profiles_frame
+from .instrument import traced
+from .similarity import encode_frame
+
+ARTIFACT_FORMAT = 3  # 3: label is "GPA below the threshold or a backlog", GPA is a feature
+RISK_MODEL_PATH = os.environ.get("ROADMAP_RISK_MODEL", os.path.join("models", "risk_model.joblib"))
+# score -> band, checked in order
+RISK_BANDS = [(0.33, "low"), (0.66, "moderate"), (1.01, "high")]
+
+
+def risk_features(frame, spec):
+    hostel = (frame["hostel"].astype(object) == "Yes").to_numpy(dtype=np.float32)[:, None]
+    return np.hstack([encode_frame(frame, spec), hostel])
+
+
+@functools.lru_cache(maxsize=None)
+def load_risk_model(path=RISK_MODEL_PATH):
+    """The artifact at `path`, read once per process; None when it is missing or incompatible."""
+    # imported here: joblib/scikit-learn are the slowest imports in the package (see skill_roadmap.warmup)
+    import joblib
+    import sklearn
+
+    try:
+        artifact = joblib.load(path)
+    except (OSError, EOFError):
+        return None
+    if artifact.get("format") != ARTIFACT_FORMAT:
+        print(f"ignoring {path}: artifact format {artifact.get('format')}, expected {ARTIFACT_FORMAT}", file=sys.stderr)
+        return None
+    if artifact.get("sklearn", "").split(".")[:2] != sklearn.__version__.split(".")[:2]:
+        print(f"warning: {path} was trained with scikit-learn {artifact.get('sklearn')}", file=sys.stderr)
+    return artifact
+
+
+@traced()
+def score_frame(artifact, frame):
+    """Risk probability for every row of a profile frame (profile keys as columns), in one call."""
+    if not len(frame):
+        return np.empty(0)
+    frame = frame.reindex(columns=PROFILE_KEYS)
+    return artifact["model"].predict_proba(risk_features(frame, artifact["spec"]))[:, 1]
+
+
+def risk_band(score):
+    return next(band for cut, band in RISK_BANDS if score < cut)
+
+
+def label_met(label, frame):
+    """Per row of a profile frame: do its own values already meet the artifact's label?"""
+    gpa = pd.to_numeric(frame["gpa"], errors="coerce").to_numpy(dtype=float)
+    failures = pd.to_numeric(frame["failures"], errors="coerce").to_numpy(dtype=float)
+    return (gpa < label["gpa_below"]) | (failures >= label["failures_at_least"])
+
+
+def label_reason(label, info):
+    """Why one profile already meets the label (e.g. "GPA below 6"), or None when the model has to score it."""
+    gpa, failures = info.get("gpa"), info.get("failures")
+    if gpa is not None and gpa < label["gpa_below"]:
+        return f"GPA below {label['gpa_below']:g}"
+    if failures is not None and failures >= label["failures_at_least"]:
+        return "already has a backlog"
+    return None
+
+
+@traced()
+def build_risk_index(artifact, df):
+    """The artifact plus a score for every dataset row, so cohort comparisons are a gather.
+
+    Rows that already meet the label score 1.0, the same as assess_risk reports for them.
+    """
+    frame = profiles_frame(df)
+    return {"artifact": artifact,
+            "scores": np.where(label_met(artifact["label"], frame), 1.0, score_frame(artifact, frame))}
+
+
+def extend_risk_index(risk, delta):
+    """`risk` plus scores for rows appended to its dataset (the frame `delta`); only the new rows are scored."""
+    added = build_risk_index(risk["artifact"], delta)["scores"]
+    return {"artifact": risk["artifact"], "scores": np.concatenate([risk["scores"], added])}
+
+
+def assess_risk(risk, info, rows=None, score=None):
+    """Score one profile (or take a precomputed `score`) and compare it with dataset `rows`, e.g. its cohort.
+
+    When the profile already meets the label the outcome is known: the band is
+    "high" and "observed" gives the reason (see label_reason), instead of the model's score.
+    """
+    observed = label_reason(risk["artifact"]["label"], info)
+    if observed:
+        score = 1.0
+    elif score is None:
+        score = float(score_frame(risk["artifact"], pd.DataFrame([info]))[0])
+    cohort = risk["scores"][rows] if rows is not None and len(rows) and risk.get("scores") is not None else None
+    return {"score": float(score), "band": risk_band(score), "observed": observed,
+            "cohort_mean": float(cohort.mean()) if cohort is not None else None,
+            "model_version": risk["artifact"].get("version")}
@@ -0,0 +1,148 @@
+"""Declarative roadmap rules (goals, risks, habits, steps).
+
+Each rule is a condition, a target section and a message template. The table
+is compiled once into a scalar check (one student's `info` dict) and a
+vectorized mask (a whole DataFrame of profiles), which give the same answer.
+
+Conditions are small tuples:
+    ("true",)                      always
+    ("<", key, value)              numeric less-than
+    ("==", key, value)             equality
+    ("in", key, (v1, v2, ...))     membership
+    ("any", cond, ...) / ("all", cond, ...) / ("not", cond)
+"""
+import string
+
+import numpy as np
+import pandas as pd
+
+SECTIONS = ("goals", "risks", "habits", "steps")
+
+LOW_GPA = ("<", "gpa", 6.0)
+LOW_STUDY = ("<", "study_hours", 3)
+WEAK_COMMUNICATION = ("in", "communication", ("Poor", "Low"))
+HIGH_STRESS = ("any", ("==", "stress_level", "High"), ("==", "confusion_level", "High"))
+
+# Order matters: messages appear in table order within each section.
+RULES = [
+    {"id": "interest_path", "section": "goals", "when": ("true",),
+     "message": "Build a clear learning path in **{interest}**."},
+    {"id": "gpa_goal", "section": "goals", "when": LOW_GPA,
+     "message": "Improve academic consistency (target +0.5 GPA next semester)."},
+    {"id": "study_goal", "section": "goals", "when": LOW_STUDY,
+     "message": "Increase study hours gradually to a sustainable level."},
+    {"id": "communication_goal", "section": "goals", "when": WEAK_COMMUNICATION,
+     "message": "Improve communication through weekly speaking/writing practice."},
+    {"id": "stress_risk", "section": "risks", "when": HIGH_STRESS,
+     "message": "High stress/confusion can reduce consistency → use weekly planning + short focused sessions."},
+    {"id": "stress_habit", "section": "habits", "when": HIGH_STRESS,
+     "message": "10 min breathing/meditation + 25/5 Pomodoro (2 cycles)."},
+    {"id": "hostel_routine", "section": "habits", "when": ("==", "hostel", "Yes"),
+     "message": "Hostel routine: fixed sleep + fixed study slot + limit late-night scrolling."},
+    {"id": "home_routine", "section": "habits", "when": ("not", ("==", "hostel", "Yes")),
+     "message": "Home routine: fixed study slot + communicate study time to family."},
+    {"id": "external_support", "section": "steps", "when": ("==", "family_support", "Low"),
+     "message": "Get external support: mentor/teacher/peer group + online communities."},
+    {"id": "family_support", "section": "steps", "when": ("not", ("==", "family_support", "Low")),
+     "message": "Use family support: share weekly goals and ask for accountability."},
+    {"id": "free_resources", "section": "steps", "when": ("==", "budget", "Low"),
+     "message": "Use free resources first + build projects (proof > certificates)."},
+    {"id": "paid_course", "section": "steps", "when": ("not", ("==", "budget", "Low")),
+     "message": "Pick 1 high-quality paid course OR mentorship for faster progress."},
+    {"id": "study_plan", "section": "steps", "when": LOW_STUDY,
+     "message": "Study plan: add +30 mins/week until you reach 3–4 hours/day."},
+    {"id": "academics", "section": "steps", "when": LOW_GPA,
+     "message": "Academics: revise daily + weekly tests + focus on weak subjects."},
+    {"id": "communication_practice", "section": "steps", "when": WEAK_COMMUNICATION,
+     "message": "Communication: 2 short talks/week + write 1 summary/day (5–7 lines)."},
+]
+
+
+def compile_condition(cond):
+    """Return (scalar_fn(info) -> bool, mask_fn(frame) -> bool ndarray) for a condition tuple."""
+    op = cond[0]
+    if op == "true":
+        return (lambda info: True), (lambda frame: np.ones(len(frame), dtype=bool))
+    if op in ("any", "all"):
+        parts = [compile_condition(c) for c in cond[1:]]
+        combine, reduce_ = (any, np.logical_or) if op == "any" else (all, np.logical_and)
+        return ((lambda info: combine(p[0](info) for p in parts)),
+                (lambda frame: reduce_.reduce([p[1](frame) for p in parts])))
+    if op == "not":
+        scalar, mask = compile_condition(cond[1])
+        return (lambda info: not scalar(info)), (lambda frame: ~mask(frame))
+
+    _, key, value = cond
+
+    def column(frame):
+        return frame[key] if key in frame.columns else pd.Series(np.nan, index=frame.index)
+
+    if op == "<":
+        return ((lambda info: info.get(key) is not None and info[key] < value),
+                (lambda frame: pd.to_numeric(column(frame), errors="coerce").to_numpy() < value))
+    if op == "==":
+        return ((lambda info: info.get(key) == value),
+                (lambda frame: (column(frame) == value).to_numpy(dtype=bool)))
+    if op == "in":
+        return ((lambda info: info.get(key) in value),
+                (lambda frame: column(frame).isin(value).to_numpy(dtype=bool)))
+    raise ValueError(f"Unknown rule condition: {cond!r}")
+
+
+def compile_rules(rules):
+    compiled = []
+    for rule in rules:
+        scalar, mask = compile_condition(rule["when"])
+        fields = [f for _, f, _, _ in string.Formatter().parse(rule["message"]) if f]
+        compiled.append(dict(rule, check=scalar, mask=mask, fields=fields))
+    return compiled
+
+
+COMPILED_RULES = compile_rules(RULES)
+
+
+def format_message(rule, info):
+    return rule["message"].format(**{f: info.get(f) for f in rule["fields"]}) if rule["fields"] else rule["message"]
+
+
+def evaluate_rules(info, rules=COMPILED_RULES):
+    """Scalar path: section -> messages for one student."""
+    sections = {s: [] for s in SECTIONS}
+    for rule in rules:
+        if rule["check"](info):
+            sections[rule["section"]].append(format_message(rule, info))
+    return sections
+
+
+def rule_masks(frame, rules=COMPILED_RULES):
+    """Vectorized path: boolean DataFrame (one row per profile, one column per rule id)."""
+    return pd.DataFrame({rule["id"]: rule["mask"](frame) for rule in rules}, index=frame.index)
+
+
+def rule_messages(frame, rules=COMPILED_RULES):
+    """Rendered message (or None) per profile and rule; templates are formatted once per distinct value."""
+    out = {}
+    for rule in rules:
+        if not rule["fields"]:
+            values = np.full(len(frame), rule["message"], dtype=object)
+        else:
+            keys = frame[rule["fields"]].astype(object)
+            keys = keys.where(keys.notna(), None)  # missing renders as "None", as in the scalar path
+            uniques = keys.drop_duplicates()
+            rendered = {tuple(row): format_message(rule, dict(zip(rule["fields"], row)))
+                        for row in uniques.itertuples(index=False)}
+            values = np.array([rendered[tuple(row)] for row in keys.itertuples(index=False)], dtype=object)
+        out[rule["id"]] = values
+    return out
+
+
+def evaluate_rules_frame(frame, rules=COMPILED_RULES):
+    """Vectorized path: one section dict per profile, identical to evaluate_rules row by row."""
+    masks = rule_masks(frame, rules).to_numpy()
+    messages = rule_messages(frame, rules)
+    results = [{s: [] for s in SECTIONS} for _ in range(len(frame))]
+    for j, rule in enumerate(rules):
+        values = messages[rule["id"]]
+        for i in np.flatnonzero(masks[:, j]):
+            results[i][rule["section"]].append(values[i])
+    return results
@@ -0,0 +1,173 @@
+"""One read-only copy of the dataset for every worker process (ROADMAP_DATA_MODE=shared).
+
+The first process that needs a dataset version parses the CSV under an
+exclusive file lock and publishes it to
+<shared_dir>/<dataset>-<version>-f<formats>/: the typed columns (the sidecar
+layout), the cohort index and each backoff level as one row-order array plus
+per-cohort bounds, and the presorted percentile arrays. A version directory
+is written under a temporary name and renamed into place, so it is never
+modified once visible. Publishing prunes that dataset's versions older than
+the previous one. Every process and session then memory-maps those files
+read-only: the OS page cache holds a single copy however many Streamlit
+workers, API processes or batch workers attach, and cohort rows and
+percentile slices are views into it.
+"""
+import hashlib
+import json
+import os
+import shutil
+from contextlib import contextmanager
+
+import numpy as np
+
+from .data import (
+    CACHE_DIR,
+    DATA_PATH,
+    SIDECAR_FORMAT,
+    build_backoff_index,
+    build_cohort_index,
+    build_options,
+    load_typed_frame,
+    read_sidecar,
+    source_signature,
+)
+from .instrument import traced
+from .percentiles import percentile_index, presort_stats
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, racing publishers just duplicate work
+    fcntl = None
+
+SHARED_DIR = os.environ.get("ROADMAP_SHARED_DIR", os.path.join(CACHE_DIR, "shared"))
+# bump when index.json or the index arrays change layout; 2: backoff levels are published too
+INDEX_FORMAT = 2
+
+
+@contextmanager
+def exclusive(lock_path):
+    with open(lock_path, "a") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def write_cohorts(target, name, cohort_index):
+    """Save the cohorts' rows as one array grouped by cohort; returns each cohort's bounds and aggregates."""
+    keys = list(cohort_index["cohorts"])
+    order = np.concatenate([cohort_index["cohorts"][k]["rows"] for k in keys]) if keys else np.empty(0, np.intp)
+    np.save(os.path.join(target, f"{name}.npy"), order)
+    bounds, start = [], 0
+    for k in keys:
+        cohort = cohort_index["cohorts"][k]
+        bounds.append({"key": list(k), "start": start, "count": cohort["count"],
+                       "sums": cohort["sums"], "counts": cohort["counts"]})
+        start += cohort["count"]
+    return bounds
+
+
+def read_cohorts(target, name, bounds):
+    order = np.load(os.path.join(target, f"{name}.npy"), mmap_mode="r")
+    return {tuple(c["key"]): {"count": c["count"], "rows": order[c["start"]:c["start"] + c["count"]],
+                              "sums": c["sums"], "counts": c["counts"]}
+            for c in bounds}
+
+
+def write_index(target, cohort_index, presorted, backoff):
+    for c in presorted["stats"]:
+        for part in ("overall", "grouped", "bounds"):
+            np.save(os.path.join(target, f"pct-{c}-{part}.npy"), presorted[part][c])
+    meta = {"keys": cohort_index["keys"], "stats": cohort_index["stats"],
+            "cohorts": write_cohorts(target, "cohort_rows", cohort_index),
+            "percentile_stats": presorted["stats"],
+            # widened levels, in backoff order; level 0 is the cohort index above
+            "backoff": [{"keys": level["keys"], "cohorts": write_cohorts(target, f"backoff_rows-{i}", level)}
+                        for i, level in enumerate(backoff["levels"][1:], 1)]}
+    with open(os.path.join(target, "index.json"), "w") as fh:
+        json.dump(meta, fh, default=lambda v: v.item() if hasattr(v, "item") else str(v))
+
+
+def read_index(target):
+    """(cohort index, percentile index, backoff index), every row array a read-only memory map."""
+    with open(os.path.join(target, "index.json")) as fh:
+        meta = json.load(fh)
+    index = {"keys": meta["keys"], "stats": meta["stats"],
+             "cohorts": read_cohorts(target, "cohort_rows", meta["cohorts"])}
+    backoff = {"levels": [index] + [
+        {"keys": level["keys"], "stats": meta["stats"],
+         "cohorts": read_cohorts(target, f"backoff_rows-{i}", level["cohorts"])}
+        for i, level in enumerate(meta["backoff"], 1)]}
+    presorted = {"stats": meta["percentile_stats"]}
+    for part in ("overall", "grouped", "bounds"):
+        presorted[part] = {c: np.load(os.path.join(target, f"pct-{c}-{part}.npy"), mmap_mode="r")
+                           for c in presorted["stats"]}
+    return index, percentile_index(index, presorted), backoff
+
+
+def dataset_key(path):
+    # several datasets can share one directory; their versions are told apart by source path
+    return hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:12]
+
+
+def version_dir(shared_dir, path, version):
+    # the sidecar format is part of the name: a layout change never reuses a published directory
+    return os.path.join(shared_dir, f"{dataset_key(path)}-{version}-f{SIDECAR_FORMAT}.{INDEX_FORMAT}")
+
+
+def prune(shared_dir, path, keep=2):
+    """Drop this dataset's published versions except the `keep` newest (the current and the previous one).
+
+    Readers that attached the previous version just before a publish keep their
+    files; older ones are unlinked, which stays valid for processes still mapping them (POSIX).
+    """
+    prefix = f"{dataset_key(path)}-"
+    names = [n for n in os.listdir(shared_dir) if n.startswith(prefix)]
+    names.sort(key=lambda n: os.stat(os.path.join(shared_dir, n)).st_mtime_ns, reverse=True)
+    for name in names[keep:]:
+        shutil.rmtree(os.path.join(shared_dir, name), ignore_errors=True)
+
+
+@traced()
+def publish_dataset(path=DATA_PATH, shared_dir=SHARED_DIR):
+    """Parse and publish the current dataset version unless another process already did; returns the version."""
+    os.makedirs(shared_dir, exist_ok=True)
+    with exclusive(os.path.join(shared_dir, ".lock")):
+        signature = source_signature(path)
+        version = "{size}-{mtime_ns}".format(**signature)  # data.dataset_version, from this one stat
+        target = version_dir(shared_dir, path, version)
+        if os.path.exists(os.path.join(target, "index.json")):
+            return version
+        tmp = f"{os.path.join(shared_dir, '.' + os.path.basename(target))}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        # parses exactly the bytes `version` names and writes their sidecar into tmp
+        df, _ = load_typed_frame(path, tmp, signature)
+        cohort_index = build_cohort_index(df)
+        write_index(tmp, cohort_index, presort_stats(df, cohort_index), build_backoff_index(cohort_index))
+        os.replace(tmp, target)
+        prune(shared_dir, path)
+    return version
+
+
+@traced()
+def attach_dataset(path=DATA_PATH, shared_dir=SHARED_DIR):
+    """Zero-copy view of the published dataset, publishing it first if needed.
+
+    Returns the same snapshot shape as refresh.DatasetStore: df, options, index,
+    backoff, percentiles and version. Every array is a read-only memory map.
+    """
+    for _ in range(3):  # the CSV may change between publishing and attaching
+        version = publish_dataset(path, shared_dir)
+        target = version_dir(shared_dir, path, version)
+        try:
+            df = read_sidecar(target, path, source_signature(path))
+            if df is not None:
+                index, percentiles, backoff = read_index(target)
+                return {"df": df, "options": build_options(df), "index": index, "backoff": backoff,
+                        "percentiles": percentiles, "version": version, "rows": len(df)}
+        except OSError:
+            continue  # another process published a newer version and pruned this one meanwhile
+    raise RuntimeError(f"{path} keeps changing; could not attach a consistent dataset version")
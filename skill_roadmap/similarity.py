@@ -0,0 +1,91 @@
+"""k-nearest-neighbour similar-student search.
+
+The dataset is encoded once into a dense float32 matrix (one-hot nominal
+categoricals, ordinal levels and numerics, all standardized) and indexed
+with scikit-learn's NearestNeighbors; a profile lookup is then one tree query.
+"""
+import numpy as np
+import pandas as pd
+
+from .data import COHORT_STATS, profiles_frame
+from .instrument import traced
+
+NOMINAL = ["branch", "interest", "skill_level"]
+ORDINAL = {
+    "stress_level": ["Low", "Medium", "High"],
+    "confusion_level": ["Low", "Medium", "High"],
+    "family_support": ["Low", "Medium", "High"],
+    "budget": ["Low", "Medium", "High"],
+    "communication": ["Poor", "Average", "Good"],
+}
+NUMERIC = ["year", "gpa", "study_hours", "sleep_hours", "failures"]
+DEFAULT_K = 25
+
+
+def _numeric_block(frame, columns):
+    block = np.empty((len(frame), len(columns)), dtype=np.float64)
+    for j, col in enumerate(columns):
+        if col in ORDINAL:
+            levels = {v: i for i, v in enumerate(ORDINAL[col])}
+            block[:, j] = frame[col].astype(object).map(levels).astype(float).to_numpy()
+        else:
+            block[:, j] = pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype=float)
+    return block
+
+
+def encode_frame(frame, spec):
+    """Encode a profile frame with a fitted spec; missing/unknown values land on the dataset mean."""
+    scaled = (_numeric_block(frame, spec["numeric"]) - spec["mean"]) / spec["scale"]
+    scaled = np.nan_to_num(scaled, nan=0.0)
+    blocks = [scaled]
+    for col in NOMINAL:
+        cats = spec["categories"][col]
+        codes = pd.Categorical(frame[col].astype(object), categories=cats).codes
+        onehot = np.zeros((len(frame), len(cats)), dtype=np.float64)
+        hit = codes >= 0
+        onehot[np.flatnonzero(hit), codes[hit]] = spec["nominal_weight"]
+        blocks.append(onehot)
+    return np.hstack(blocks).astype(np.float32)
+
+
+def fit_encoding(frame, nominal_weight=1.0, exclude=()):
+    """Standardization stats and category lists for encode_frame, learned from a profile frame."""
+    numeric = [c for c in NUMERIC + list(ORDINAL) if c not in exclude]
+    raw = _numeric_block(frame, numeric)
+    mean = np.nanmean(raw, axis=0)
+    scale = np.nanstd(raw, axis=0)
+    return {
+        "numeric": numeric,
+        "mean": np.nan_to_num(mean),
+        "scale": np.where(np.nan_to_num(scale) > 0, np.nan_to_num(scale), 1.0),
+        "categories": {col: sorted(frame[col].dropna().astype(object).unique().tolist()) for col in NOMINAL},
+        "nominal_weight": nominal_weight,
+    }
+
+
+@traced()
+def build_knn_index(df, nominal_weight=1.0):
+    """Encode the dataset once and fit the neighbour index over it."""
+    frame = profiles_frame(df)
+    spec = fit_encoding(frame, nominal_weight)
+    matrix = encode_frame(frame, spec)
+    from sklearn.neighbors import NearestNeighbors  # scikit-learn loads on first use, not at startup
+    nn = NearestNeighbors().fit(matrix)
+    stats = {c: pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float) for c in COHORT_STATS if c in df.columns}
+    return {"spec": spec, "matrix": matrix, "nn": nn, "stats": stats}
+
+
+@traced()
+def knn_lookup(knn, info, k=DEFAULT_K):
+    """Top-k neighbours of one profile: row positions, distances and stat means."""
+    k = min(k, len(knn["matrix"]))
+    query = encode_frame(pd.DataFrame([info]).reindex(columns=list(knn["spec"]["numeric"]) + NOMINAL), knn["spec"])
+    distances, rows = knn["nn"].kneighbors(query, n_neighbors=k)
+    rows = rows[0]
+    means = {c: float(np.nanmean(v[rows])) if len(rows) else float("nan") for c, v in knn["stats"].items()}
+    return {"count": len(rows), "rows": rows, "distances": distances[0], "means": means}
+
+
+def knn_similar_students(df, knn, info, k=DEFAULT_K):
+    """The neighbour rows themselves, nearest first."""
+    return df.iloc[knn_lookup(knn, info, k)["rows"]]
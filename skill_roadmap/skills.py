@@ -0,0 +1,386 @@
+"""Job-role skill catalogue and skill-gap helpers."""
+import numpy as np
+
+from .instrument import traced
+
+
+JOB_SKILL_ANALYSIS = {
+    "Software Developer": {
+        "skills": [
+            "Python / Java",
+            "Data Structures & Algorithms",
+            "HTML, CSS, JavaScript",
+            "Git & GitHub",
+            "Databases (SQL)",
+            "OOPS",
+            "Problem Solving"
+        ],
+        "projects": [
+            "Student Management System",
+            "Task Tracker Application",
+            "Portfolio Website",
+            "REST API Mini Project"
+        ],
+        "resources": [
+            "NPTEL – Programming & DSA",
+            "YouTube – freeCodeCamp",
+            "GeeksForGeeks – DSA",
+            "GitHub – Open Source Projects"
+        ]
+    },
+    "Frontend Developer": {
+        "skills": [
+            "HTML",
+            "CSS",
+            "JavaScript",
+            "React",
+            "Responsive Design",
+            "Git & GitHub"
+        ],
+        "projects": [
+            "Portfolio Website",
+            "React To-Do App",
+            "UI Clone (Netflix / Amazon)"
+        ],
+        "resources": [
+            "MDN Web Docs",
+            "Traversy Media (YouTube)",
+            "React Official Docs"
+        ]
+    },
+    "Backend Developer": {
+        "skills": [
+            "Node.js / Python / Java",
+            "Databases (SQL/NoSQL)",
+            "APIs / RESTful Services",
+            "Git & GitHub",
+            "Authentication & Security"
+        ],
+        "projects": [
+            "REST API Project",
+            "E-commerce Backend",
+            "Blog Platform Backend"
+        ],
+        "resources": [
+            "Udemy Backend Courses",
+            "YouTube - Tech With Tim / Traversy Media",
+            "MongoDB University"
+        ]
+    },
+    "Data Scientist": {
+        "skills": [
+            "Python",
+            "Statistics",
+            "Pandas & NumPy",
+            "Data Visualization",
+            "Machine Learning Basics"
+        ],
+        "projects": [
+            "Student Performance Analysis",
+            "Sales Prediction Model",
+            "EDA Project"
+        ],
+        "resources": [
+            "Kaggle Learn",
+            "Krish Naik (YouTube)",
+            "Coursera ML (Audit Mode)"
+        ]
+    },
+    "Machine Learning Engineer": {
+        "skills": [
+            "Python",
+            "Linear Algebra & Statistics",
+            "Scikit-learn / TensorFlow / PyTorch",
+            "Data Preprocessing",
+            "Model Deployment"
+        ],
+        "projects": [
+            "Predictive Analytics Model",
+            "Image Classification Project",
+            "Recommendation System"
+        ],
+        "resources": [
+            "Fast.ai Courses",
+            "DeepLearning.ai (Coursera)",
+            "YouTube - Sentdex / Krish Naik"
+        ]
+    },
+    "DevOps Engineer": {
+        "skills": [
+            "Linux / Shell Scripting",
+            "CI/CD (Jenkins/GitHub Actions)",
+            "Docker / Kubernetes",
+            "Cloud Platforms (AWS / GCP / Azure)",
+            "Monitoring & Logging"
+        ],
+        "projects": [
+            "CI/CD Pipeline Setup",
+            "Dockerized Application Deployment",
+            "Cloud Infrastructure Project"
+        ],
+        "resources": [
+            "Linux Academy / A Cloud Guru",
+            "YouTube - TechWorld with Nana",
+            "Official Docker & Kubernetes Docs"
+        ]
+    },
+    "UI/UX Designer": {
+        "skills": [
+            "Figma / Adobe XD",
+            "Wireframing & Prototyping",
+            "User Research & Testing",
+            "Responsive Design Principles",
+            "Portfolio Creation"
+        ],
+        "projects": [
+            "Mobile App Wireframes",
+            "Website Redesign Project",
+            "Interactive Prototype"
+        ],
+        "resources": [
+            "Figma Learn Tutorials",
+            "Coursera UI/UX Courses",
+            "YouTube - DesignCourse / CharliMarieTV"
+        ]
+    },
+    "Cybersecurity Analyst": {
+        "skills": [
+            "Networking Basics",
+            "Linux & Windows Security",
+            "Penetration Testing",
+            "Firewalls & IDS/IPS",
+            "Security Tools (Wireshark, Nmap)"
+        ],
+        "projects": [
+            "Vulnerability Assessment",
+            "Phishing Simulation",
+            "Secure Web Application Setup"
+        ],
+        "resources": [
+            "TryHackMe / Hack The Box",
+            "Cybrary Courses",
+            "YouTube - NetworkChuck / The Cyber Mentor"
+        ]
+    },
+    "Mobile App Developer": {
+        "skills": [
+            "Java / Kotlin / Swift / Flutter",
+            "UI/UX for Mobile",
+            "APIs & Backend Integration",
+            "App Deployment (Play Store / App Store)",
+            "Debugging & Testing"
+        ],
+        "projects": [
+            "Todo App",
+            "Weather Forecast App",
+            "E-commerce Mobile App"
+        ],
+        "resources": [
+            "Udemy Mobile App Courses",
+            "YouTube - CodeWithChris / The Net Ninja",
+            "Official Flutter Docs"
+        ]
+    },
+    "Cloud Engineer": {
+        "skills": [
+            "AWS / Azure / GCP",
+            "Cloud Architecture & Design",
+            "Networking & Security",
+            "CI/CD Pipelines",
+            "Infrastructure as Code (Terraform)"
+        ],
+        "projects": [
+            "Deploy Web App on Cloud",
+            "Serverless Application Project",
+            "Cloud Monitoring Setup"
+        ],
+        "resources": [
+            "AWS / Azure / GCP Official Docs",
+            "A Cloud Guru Courses",
+            "YouTube - TechWorld with Nana"
+        ]
+    },
+    "Business Analyst": {
+        "skills": [
+            "Excel / SQL / Tableau / PowerBI",
+            "Requirement Gathering",
+            "Process Modeling",
+            "Data Analysis & Reporting",
+            "Communication & Presentation"
+        ],
+        "projects": [
+            "Sales Dashboard",
+            "Customer Analysis Report",
+            "Process Optimization Project"
+        ],
+        "resources": [
+            "Coursera Business Analytics",
+            "Udemy SQL / Tableau Courses",
+            "YouTube - Analytics University"
+        ]
+    },
+    "Digital Marketing Specialist": {
+        "skills": [
+            "SEO / SEM",
+            "Google Analytics",
+            "Content Creation",
+            "Social Media Marketing",
+            "Email Marketing"
+        ],
+        "projects": [
+            "SEO Campaign Project",
+            "Social Media Ad Campaign",
+            "Email Marketing Automation"
+        ],
+        "resources": [
+            "Google Digital Garage",
+            "HubSpot Academy",
+            "YouTube - Neil Patel / Brian Dean"
+        ]
+    },
+    "Blockchain Developer": {
+        "skills": [
+            "Solidity / Ethereum",
+            "Smart Contracts",
+            "Web3.js / Ethers.js",
+            "Blockchain Architecture",
+            "Cryptography Basics"
+        ],
+        "projects": [
+            "Smart Contract Deployment",
+            "NFT Minting Platform",
+            "Decentralized App (DApp)"
+        ],
+        "resources": [
+            "CryptoZombies.io",
+            "Coursera Blockchain Courses",
+            "YouTube - Dapp University"
+        ]
+    },
+    "AI Researcher": {
+        "skills": [
+            "Python / R",
+            "Mathematics (Linear Algebra, Probability)",
+            "Deep Learning",
+            "NLP / Computer Vision",
+            "Research Paper Reading & Implementation"
+        ],
+        "projects": [
+            "Image Captioning Model",
+            "Text Summarization Model",
+            "Custom Neural Network Research"
+        ],
+        "resources": [
+            "arXiv Papers",
+            "DeepLearning.ai",
+            "YouTube - Yannic Kilcher / Two Minute Papers"
+        ]
+    }
+}
+
+
+def compute_skill_gap(required_skills, known_skills):
+    known = [s for s in required_skills if s in known_skills]
+    missing = [s for s in required_skills if s not in known_skills]
+    return known, missing
+
+
+# ---------------- Compiled catalogue ----------------
+# Each role is a bitmask over a shared skill vocabulary (bit i = VOCAB[i]), with an
+# inverted skill -> roles index, so ranking every role is a few integer/bitwise ops.
+POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def compile_skill_catalog(catalog):
+    vocab = sorted({skill for info in catalog.values() for skill in info["skills"]})
+    bit = {skill: i for i, skill in enumerate(vocab)}
+    roles = list(catalog)
+    masks = [sum(1 << bit[s] for s in set(catalog[r]["skills"])) for r in roles]
+    inverted = {skill: [] for skill in vocab}
+    for r, role in enumerate(roles):
+        for skill in dict.fromkeys(catalog[role]["skills"]):
+            inverted[skill].append(r)
+    role_bits = np.zeros((len(roles), len(vocab)), dtype=bool)
+    for r, role in enumerate(roles):
+        role_bits[r, [bit[s] for s in catalog[role]["skills"]]] = True
+    return {
+        "vocab": vocab,
+        "bit": bit,
+        "roles": roles,
+        "masks": masks,
+        "sizes": np.array([m.bit_count() for m in masks], dtype=np.int32),
+        "inverted": {s: np.array(r, dtype=np.int32) for s, r in inverted.items()},
+        "packed": np.packbits(role_bits, axis=1),
+        "catalog": catalog,
+    }
+
+
+SKILL_CATALOG = compile_skill_catalog(JOB_SKILL_ANALYSIS)
+
+
+def skills_to_mask(known_skills, compiled=SKILL_CATALOG):
+    """Bitmask of the known skills; skills outside the vocabulary are ignored."""
+    bit = compiled["bit"]
+    return sum(1 << bit[s] for s in set(known_skills) if s in bit)
+
+
+def role_gap(role, known_skills, compiled=SKILL_CATALOG):
+    """(known, missing) for one role in catalogue order, via the role bitmask."""
+    mask = skills_to_mask(known_skills, compiled)
+    bit = compiled["bit"]
+    skills = compiled["catalog"][role]["skills"]
+    known = [s for s in skills if mask >> bit[s] & 1]
+    missing = [s for s in skills if not mask >> bit[s] & 1]
+    return known, missing
+
+
+@traced()
+def rank_roles(known_skills, compiled=SKILL_CATALOG, top=None):
+    """Rank every role by coverage of the known skills.
+
+    Overlap counts come from the inverted index (one pass over the known
+    skills), so roles sharing nothing with the student cost nothing until the
+    final sort. Returns dicts with role, coverage, matched, required, known, missing.
+    """
+    overlap = np.zeros(len(compiled["roles"]), dtype=np.int32)
+    for skill in set(known_skills):
+        roles = compiled["inverted"].get(skill)
+        if roles is not None:
+            overlap[roles] += 1
+    coverage = overlap / np.maximum(compiled["sizes"], 1)
+    order = np.lexsort((np.arange(len(coverage)), -overlap, -coverage))
+    if top is not None:
+        order = order[:top]
+    ranking = []
+    for r in order:
+        role = compiled["roles"][r]
+        known, missing = role_gap(role, known_skills, compiled)
+        ranking.append({"role": role, "coverage": float(coverage[r]), "matched": int(overlap[r]),
+                        "required": int(compiled["sizes"][r]), "known": known, "missing": missing})
+    return ranking
+
+
+def skill_matrix(students_skills, compiled=SKILL_CATALOG):
+    """Pack many students' skill lists into a (students x vocab-bytes) uint8 bit matrix."""
+    bits = np.zeros((len(students_skills), len(compiled["vocab"])), dtype=bool)
+    bit = compiled["bit"]
+    for i, skills in enumerate(students_skills):
+        cols = [bit[s] for s in skills if s in bit]
+        bits[i, cols] = True
+    return np.packbits(bits, axis=1)
+
+
+def rank_roles_batch(packed_students, compiled=SKILL_CATALOG, chunk_size=4096):
+    """Coverage of every role for every student: (students x roles) float matrix.
+
+    `packed_students` is the output of skill_matrix(). Overlap is AND + popcount
+    over packed bytes, done in student chunks to bound the temporary array.
+    """
+    roles = compiled["packed"]
+    sizes = np.maximum(compiled["sizes"], 1)
+    coverage = np.empty((len(packed_students), len(roles)), dtype=np.float32)
+    for start in range(0, len(packed_students), chunk_size):
+        block = packed_students[start:start + chunk_size]
+        overlap = POPCOUNT8[block[:, None, :] & roles[None, :, :]].sum(axis=2, dtype=np.int32)
+        coverage[start:start + chunk_size] = overlap / sizes
+    return coverage
@@ -0,0 +1,112 @@
+"""Offline training for the academic-risk model.
+
+    python -m skill_roadmap.train_risk --data student_performance_extended.csv --out models/risk_model.joblib
+
+A student counts as struggling when their GPA is below the rule-table
+threshold (6.0) or they have at least one backlog. Both describe the
+student now, so the model's output is a relative risk score, not the
+probability of a future outcome. A profile that already meets the label is
+reported as such rather than scored (see risk.label_reason).
+
+The features are GPA, study and sleep hours, stress, confusion, family
+support, communication, budget, hostel, year, branch, interest and skill
+level, in the encoding shared with the kNN search (similarity.fit_encoding)
+plus hostel. Failures is left out: in this dataset it only tracks stress and
+would drown out the rest. The model is a logistic regression, cheap to
+compute and monotone in every feature. Training fails unless the score rises
+as GPA falls (check_gpa_monotonic).
+
+The artifact bundles the encoder spec, the fitted model, the label
+definition, held-out metrics and a version string (UTC time + training-data
+hash). skill_roadmap.risk loads and scores it.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import brier_score_loss, roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from .data import DATA_PATH, file_hash, load_typed_dataset, profiles_frame
+from .instrument import traced
+from .risk import ARTIFACT_FORMAT, RISK_MODEL_PATH, label_met, risk_features, score_frame
+from .similarity import fit_encoding
+
+DEFAULT_LABEL = {"gpa_below": 6.0, "failures_at_least": 1}
+# left out of the features; GPA stays in, so the score can follow it
+LABEL_COLUMNS = ("failures",)
+MONOTONIC_GPA_GRID = np.linspace(4.0, 10.0, 13)
+
+
+def risk_labels(frame, label=DEFAULT_LABEL):
+    return label_met(label, frame).astype(np.int8)
+
+
+def check_gpa_monotonic(artifact, frame, samples=200, seed=0):
+    """Raise ValueError unless, for sampled profiles, the score never falls as GPA falls and ends higher."""
+    rows = frame.sample(min(samples, len(frame)), random_state=seed)
+    grid = np.tile(MONOTONIC_GPA_GRID, len(rows))
+    scores = score_frame(artifact, rows.loc[rows.index.repeat(len(MONOTONIC_GPA_GRID))].assign(gpa=grid))
+    scores = scores.reshape(len(rows), len(MONOTONIC_GPA_GRID))  # columns: GPA ascending
+    if (np.diff(scores, axis=1) > 1e-9).any() or not (scores[:, 0] > scores[:, -1]).all():
+        raise ValueError("risk score does not rise as GPA falls; not saving this model")
+
+
+@traced()
+def train_risk_model(df, label=DEFAULT_LABEL, test_size=0.2, seed=0):
+    """Fit the model on a typed dataset frame; returns the artifact dict (not yet saved)."""
+    frame = profiles_frame(df)
+    y = risk_labels(frame, label)
+    spec = fit_encoding(frame, exclude=LABEL_COLUMNS)
+    x = risk_features(frame, spec)
+    x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=test_size, random_state=seed, stratify=y)
+    held_out = LogisticRegression(max_iter=1000).fit(x_train, y_train).predict_proba(x_test)[:, 1]
+    metrics = {"rows": len(frame), "positive_rate": float(y.mean()),
+               "roc_auc": float(roc_auc_score(y_test, held_out)), "brier": float(brier_score_loss(y_test, held_out))}
+    model = LogisticRegression(max_iter=1000).fit(x, y)  # final model uses every row
+    artifact = {"format": ARTIFACT_FORMAT, "sklearn": sklearn.__version__, "label": dict(label),
+                "spec": spec, "model": model, "metrics": metrics}
+    check_gpa_monotonic(artifact, frame)
+    return artifact
+
+
+def save_risk_model(artifact, path, data_path=None):
+    """Stamp a version (UTC time + training-data hash) and write the artifact atomically."""
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    digest = file_hash(data_path)[:12] if data_path else "unknown"
+    artifact = dict(artifact, version=f"{stamp}-{digest}")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    joblib.dump(artifact, tmp)
+    os.replace(tmp, path)
+    return artifact
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the academic-risk model and save it as an artifact.")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--out", default=RISK_MODEL_PATH)
+    parser.add_argument("--gpa-below", type=float, default=DEFAULT_LABEL["gpa_below"])
+    parser.add_argument("--failures-at-least", type=int, default=DEFAULT_LABEL["failures_at_least"],
+                        help="backlogs that make a student count as at risk")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    df, _ = load_typed_dataset(args.data)
+    label = {"gpa_below": args.gpa_below, "failures_at_least": args.failures_at_least}
+    try:
+        artifact = train_risk_model(df, label, seed=args.seed)
+    except ValueError as exc:
+        sys.exit(str(exc))
+    artifact = save_risk_model(artifact, args.out, args.data)
+    print(json.dumps({"out": args.out, "version": artifact["version"], "label": label, **artifact["metrics"]}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
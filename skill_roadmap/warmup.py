@@ -0,0 +1,99 @@
+"""Background warm-up of the slow parts of a cold start.
+
+The home page starts it and returns at once. While the visitor reads that page,
+a daemon thread does the following:
+
+- imports what the roadmap page needs (pandas, the engine, ...)
+- loads the dataset (parsing the CSV into the sidecar on a cold cache, or
+  publishing the shared copy)
+- reads the risk artifact, which is what imports scikit-learn (a DatasetStore
+  already read it during the dataset phase, to score the rows)
+- builds the hero image variants
+
+The roadmap page's loaders call wait_for_warmup and pick up the warmed
+DatasetStore, so at most they wait for whatever is still running. Every
+phase is recorded with instrument.startup_phase. To run it in the
+foreground and print the phases:
+
+    python -m skill_roadmap.warmup
+"""
+import importlib
+import sys
+import threading
+import traceback
+
+from .instrument import STARTUP, startup_phase
+
+# the roadmap page's imports; pandas alone is most of their cost
+WARM_MODULES = ["pandas", "skill_roadmap.engine", "skill_roadmap.cache", "skill_roadmap.refresh",
+                "skill_roadmap.shared", "skill_roadmap.skills", "skill_roadmap.explorer",
+                "skill_roadmap.analytics", "skill_roadmap.export"]
+
+WARMED = {}  # name -> object the page can adopt, e.g. "dataset_store"
+_thread = None
+_lock = threading.Lock()
+_ready = threading.Event()
+
+
+def warm_up(data_path=None):
+    with startup_phase("warmup_imports"):
+        for name in WARM_MODULES:
+            importlib.import_module(name)
+    from .assets import HERO_IMAGE, build_variants
+    from .data import DATA_PATH
+    from .ingest import data_mode
+    from .refresh import DatasetStore
+    from .risk import load_risk_model
+    from .shared import publish_dataset
+
+    path = data_path or DATA_PATH
+    mode = data_mode(path)
+    with startup_phase("warmup_dataset"):
+        if mode == "typed":
+            WARMED["dataset_store"] = DatasetStore(path)
+        elif mode == "shared":
+            publish_dataset(path)
+        # a streamed dataset is read by the page's own single pass; nothing to prepare
+    with startup_phase("warmup_risk_model"):
+        load_risk_model()  # lru-cached per process, so the page (and a DatasetStore) reuses it
+    _ready.set()  # what the roadmap page waits for; the image variants can finish after
+    with startup_phase("warmup_assets"):
+        try:
+            build_variants(HERO_IMAGE)
+        except (ImportError, OSError, ValueError) as exc:
+            print(f"hero image variants not built: {exc}", file=sys.stderr)
+
+
+def _run(data_path):
+    try:
+        warm_up(data_path)
+    except Exception:
+        traceback.print_exc()  # the page then just does the work itself
+    finally:
+        _ready.set()
+
+
+def start_warmup(data_path=None):
+    """Start warm_up in a daemon thread, once per process; returns the thread."""
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, args=(data_path,), name="roadmap-warmup", daemon=True)
+            _thread.start()
+        return _thread
+
+
+def wait_for_warmup(timeout=None):
+    """Block until a started warm-up has the dataset and model ready; returns at once when none was started."""
+    if _thread is not None:
+        _ready.wait(timeout)
+
+
+def main(argv=None):
+    warm_up(argv[0] if argv else None)
+    for name, phase in STARTUP.items():
+        print(f"{name:<20} {phase['ms']:>9.1f} ms  (done at {phase['at_ms']:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
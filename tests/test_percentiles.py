@@ -0,0 +1,61 @@
+"""Exact percentile indexes extend like a rebuild; sketches stay within their rank error."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from skill_roadmap.data import DATA_PATH, apply_schema, build_cohort_index
+from skill_roadmap.percentiles import QuantileSketch, build_percentile_index, extend_percentile_index
+
+DF = apply_schema(pd.read_csv(DATA_PATH, nrows=2000))
+
+
+def test_extend_percentile_index_matches_rebuild():
+    old, new = DF.iloc[:1500].reset_index(drop=True), DF.iloc[1500:].reset_index(drop=True)
+    pindex = extend_percentile_index(build_percentile_index(old, build_cohort_index(old)), new, build_cohort_index(new))
+    want = build_percentile_index(DF, build_cohort_index(DF))
+    assert pindex["cohorts"].keys() == want["cohorts"].keys()
+    for c in want["stats"]:
+        np.testing.assert_array_equal(pindex["overall"][c], want["overall"][c])
+        for key, arrays in want["cohorts"].items():
+            np.testing.assert_array_equal(pindex["cohorts"][key][c], arrays[c])
+
+
+def test_extend_percentile_index_skips_missing_values():
+    old, new = DF.iloc[:100].reset_index(drop=True), DF.iloc[100:110].reset_index(drop=True)
+    new = new.assign(gpa=np.nan)
+    pindex = build_percentile_index(old, build_cohort_index(old))
+    extended = extend_percentile_index(pindex, new, build_cohort_index(new))
+    np.testing.assert_array_equal(extended["overall"]["gpa"], pindex["overall"]["gpa"])
+    assert len(extended["overall"]["study_hours"]) == len(pindex["overall"]["study_hours"]) + 10
+
+
+def test_sketch_is_exact_below_k():
+    values = np.random.default_rng(0).normal(size=200)
+    sketch = QuantileSketch(k=256)
+    sketch.update(values)
+    ordered = np.sort(values)
+    for q in values[:20]:
+        assert sketch.counts(q) == (np.searchsorted(ordered, q, "left"), np.searchsorted(ordered, q, "right"))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_sketch_rank_error_is_bounded(seed):
+    values = np.random.default_rng(seed).normal(size=200_000)
+    chunked, left, right = QuantileSketch(seed=seed), QuantileSketch(seed=seed), QuantileSketch(seed=seed + 1)
+    for chunk in np.array_split(values, 20):
+        chunked.update(chunk)
+    left.update(values[:120_000])
+    right.update(values[120_000:])
+    left.merge(right)
+    ordered = np.sort(values)
+    for sketch in (chunked, left):
+        assert sketch.n == len(values)
+        assert sum(len(level) for level in sketch.levels) <= sketch.k * len(sketch.levels)
+        for q in np.quantile(values, np.linspace(0.01, 0.99, 99)):
+            assert abs(sketch.counts(q)[0] - np.searchsorted(ordered, q)) <= 0.02 * len(values)
+
+
+def test_sketch_ignores_nan():
+    sketch = QuantileSketch()
+    sketch.update([1.0, np.nan, 2.0])
+    assert sketch.n == 2 and sketch.counts(1.5) == (1, 1)
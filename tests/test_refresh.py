@@ -0,0 +1,122 @@
+"""DatasetStore appends and the incremental cohort indexes agree with a full rebuild."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from skill_roadmap.analytics import CUBE_DIMENSIONS
+from skill_roadmap.data import (
+    DATA_PATH,
+    apply_schema,
+    build_backoff_index,
+    build_cohort_index,
+    extend_backoff_index,
+    extend_cohort_index,
+)
+from skill_roadmap.refresh import DatasetStore
+
+with open(DATA_PATH, "rb") as _fh:
+    LINES = _fh.read().splitlines(keepends=True)
+
+
+def write_rows(path, start, stop, mode="wb"):
+    with open(path, mode) as fh:
+        if mode == "wb":
+            fh.write(LINES[0])
+        fh.writelines(LINES[1 + start:1 + stop])
+
+
+def typed_rows(start, stop):
+    return apply_schema(pd.read_csv(DATA_PATH, skiprows=range(1, 1 + start), nrows=stop - start))
+
+
+def assert_same_index(got, want):
+    assert got["keys"] == want["keys"] and got["stats"] == want["stats"]
+    assert got["cohorts"].keys() == want["cohorts"].keys()
+    for key, cohort in want["cohorts"].items():
+        other = got["cohorts"][key]
+        assert other["count"] == cohort["count"]
+        np.testing.assert_array_equal(other["rows"], cohort["rows"])
+        assert other["counts"] == cohort["counts"]
+        assert other["sums"] == pytest.approx(cohort["sums"])
+
+
+def assert_same_backoff(got, want):
+    assert len(got["levels"]) == len(want["levels"])
+    for level, expected in zip(got["levels"], want["levels"]):
+        # levels list rows by sub cohort, not by position
+        level = dict(level, cohorts={k: dict(c, rows=np.sort(c["rows"])) for k, c in level["cohorts"].items()})
+        expected = dict(expected, cohorts={k: dict(c, rows=np.sort(c["rows"])) for k, c in expected["cohorts"].items()})
+        assert_same_index(level, expected)
+
+
+def test_extend_cohort_index_matches_rebuild():
+    old, new = typed_rows(0, 700), typed_rows(700, 1000)
+    index = extend_cohort_index(build_cohort_index(old), build_cohort_index(new), len(old))
+    assert_same_index(index, build_cohort_index(pd.concat([old, new], ignore_index=True)))
+
+
+def test_extend_cohort_index_leaves_old_index_alone():
+    old = build_cohort_index(typed_rows(0, 500))
+    before = {key: cohort["rows"].copy() for key, cohort in old["cohorts"].items()}
+    extend_cohort_index(old, build_cohort_index(typed_rows(500, 800)), 500)
+    assert old["cohorts"].keys() == before.keys()
+    for key, rows in before.items():
+        np.testing.assert_array_equal(old["cohorts"][key]["rows"], rows)
+
+
+def test_extend_backoff_index_matches_rebuild():
+    old, new = typed_rows(0, 600), typed_rows(600, 900)
+    delta = build_cohort_index(new)
+    index = extend_cohort_index(build_cohort_index(old), delta, len(old))
+    backoff = extend_backoff_index(build_backoff_index(build_cohort_index(old)), index, delta, len(old))
+    assert backoff["levels"][0] is index
+    assert_same_backoff(backoff, build_backoff_index(build_cohort_index(pd.concat([old, new], ignore_index=True))))
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    path = tmp_path / "students.csv"
+    write_rows(path, 0, 800)
+    return path
+
+
+def assert_same_snapshot(got, want):
+    assert got["rows"] == want["rows"]
+    pd.testing.assert_frame_equal(got["df"], want["df"], check_dtype=False, check_categorical=False)
+    assert_same_index(got["index"], want["index"])
+    assert_same_backoff(got["backoff"], want["backoff"])
+    for c in want["percentiles"]["stats"]:
+        np.testing.assert_array_equal(got["percentiles"]["overall"][c], want["percentiles"]["overall"][c])
+    if want["risk"] is not None:
+        np.testing.assert_allclose(got["risk"]["scores"], want["risk"]["scores"])
+    cells = [c.astype({d: str for d in CUBE_DIMENSIONS}).sort_values(CUBE_DIMENSIONS, ignore_index=True)
+             for c in (got["cube_cells"], want["cube_cells"])]
+    pd.testing.assert_frame_equal(*cells, check_dtype=False)
+
+
+def test_store_append_matches_full_load(store_path, tmp_path):
+    store = DatasetStore(str(store_path), str(tmp_path / "cache"))
+    write_rows(store_path, 800, 1000, mode="ab")
+    snapshot = store.refresh()
+    assert (store.full_loads, store.refreshes, snapshot["rows"]) == (1, 1, 1000)
+    assert_same_snapshot(snapshot, DatasetStore(str(store_path), str(tmp_path / "fresh")).snapshot)
+
+
+def test_store_waits_for_a_whole_last_line(store_path, tmp_path):
+    store = DatasetStore(str(store_path), str(tmp_path / "cache"))
+    line = LINES[801]
+    with open(store_path, "ab") as fh:
+        fh.write(line[:10])
+    assert store.refresh()["rows"] == 800
+    with open(store_path, "ab") as fh:
+        fh.write(line[10:])
+    assert store.refresh()["rows"] == 801
+    assert store.full_loads == 1
+
+
+def test_store_reloads_a_rewritten_file(store_path, tmp_path):
+    store = DatasetStore(str(store_path), str(tmp_path / "cache"))
+    write_rows(store_path, 200, 900)
+    snapshot = store.refresh()
+    assert store.full_loads == 2 and snapshot["rows"] == 700
+    assert snapshot["df"]["student_id"].iloc[0] == typed_rows(200, 201)["student_id"].iloc[0]
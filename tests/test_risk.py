@@ -0,0 +1,40 @@
+"""Risk scores extend like a rebuild and follow GPA."""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+
+from skill_roadmap.data import DATA_PATH, apply_schema, profiles_frame, row_to_profile  # noqa: E402
+from skill_roadmap.risk import assess_risk, build_risk_index, extend_risk_index  # noqa: E402
+from skill_roadmap.train_risk import check_gpa_monotonic, train_risk_model  # noqa: E402
+
+DF = apply_schema(pd.read_csv(DATA_PATH, nrows=3000))
+
+
+@pytest.fixture(scope="module")
+def artifact():
+    return train_risk_model(DF)
+
+
+def test_extend_risk_index_matches_rebuild(artifact):
+    old, new = DF.iloc[:2500].reset_index(drop=True), DF.iloc[2500:].reset_index(drop=True)
+    risk = extend_risk_index(build_risk_index(artifact, old), new)
+    np.testing.assert_allclose(risk["scores"], build_risk_index(artifact, DF)["scores"])
+
+
+def test_rows_meeting_the_label_score_high(artifact):
+    info = dict(row_to_profile(DF.iloc[0]), gpa=5.0)
+    assessment = assess_risk(build_risk_index(artifact, DF), info, rows=np.arange(10))
+    assert assessment["observed"] == "GPA below 6"
+    assert (assessment["score"], assessment["band"]) == (1.0, "high")
+
+
+def test_a_model_that_ignores_gpa_is_rejected(artifact):
+    check_gpa_monotonic(artifact, profiles_frame(DF))
+    model = artifact["model"]
+    flipped = dict(artifact, model=type(model)().set_params(**model.get_params()))
+    flipped["model"].classes_, flipped["model"].intercept_ = model.classes_, model.intercept_
+    flipped["model"].coef_ = -model.coef_
+    with pytest.raises(ValueError):
+        check_gpa_monotonic(flipped, profiles_frame(DF))
@@ -0,0 +1,31 @@
+"""The vectorized rule path gives every profile the same sections as the scalar one."""
+import re
+
+import numpy as np
+import pandas as pd
+
+from skill_roadmap.data import DATA_PATH, apply_schema, profiles_frame, row_to_profile
+from skill_roadmap.rules import evaluate_rules, evaluate_rules_frame
+
+
+def check_frame(df):
+    frame = profiles_frame(df)
+    got = evaluate_rules_frame(frame)
+    assert len(got) == len(df)
+    for sections, (_, row) in zip(got, df.iterrows()):
+        assert sections == evaluate_rules(row_to_profile(row))
+
+
+def test_frame_matches_scalar():
+    check_frame(apply_schema(pd.read_csv(DATA_PATH, nrows=1000)))
+
+
+def test_frame_matches_scalar_with_missing_values():
+    df = apply_schema(pd.read_csv(DATA_PATH, nrows=200))
+    rng = np.random.default_rng(0)
+    for col in ("gpa", "study_hours", "sleep_hours", "interest", "stress_level", "skill_level"):
+        df.loc[rng.random(len(df)) < 0.2, col] = np.nan
+    frame = profiles_frame(df)
+    for sections in evaluate_rules_frame(frame):
+        assert not any(re.search(r"\bnan\b", message) for messages in sections.values() for message in messages)
+    check_frame(df)
@@ -0,0 +1,75 @@
+"""Shared mode: attach survives a version pruned under it; prune keeps other datasets."""
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from skill_roadmap import shared
+from skill_roadmap.data import DATA_PATH, build_backoff_index, build_cohort_index
+
+with open(DATA_PATH, "rb") as _fh:
+    LINES = _fh.read().splitlines(keepends=True)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "students.csv"
+    path.write_bytes(b"".join(LINES[:501]))
+    return str(path)
+
+
+def test_attach_matches_a_rebuild(csv_path, tmp_path):
+    current = shared.attach_dataset(csv_path, str(tmp_path / "shared"))
+    assert current["rows"] == 500
+    want = build_cohort_index(current["df"])
+    assert current["index"]["cohorts"].keys() == want["cohorts"].keys()
+    for key, cohort in want["cohorts"].items():
+        np.testing.assert_array_equal(current["index"]["cohorts"][key]["rows"], cohort["rows"])
+    levels = build_backoff_index(want)["levels"]
+    assert [level["keys"] for level in current["backoff"]["levels"]] == [level["keys"] for level in levels]
+    for level, expected in zip(current["backoff"]["levels"], levels):
+        assert level["cohorts"].keys() == expected["cohorts"].keys()
+        for key, cohort in expected["cohorts"].items():
+            np.testing.assert_array_equal(np.sort(level["cohorts"][key]["rows"]), np.sort(cohort["rows"]))
+
+
+def test_attach_retries_after_a_prune(csv_path, tmp_path, monkeypatch):
+    shared_dir = str(tmp_path / "shared")
+    read_index, calls = shared.read_index, []
+
+    def pruned_once(target):
+        calls.append(target)
+        if len(calls) == 1:  # another process pruned this version between publish and read
+            shutil.rmtree(target)
+            raise FileNotFoundError(os.path.join(target, "index.json"))
+        return read_index(target)
+
+    monkeypatch.setattr(shared, "read_index", pruned_once)
+    current = shared.attach_dataset(csv_path, shared_dir)
+    assert len(calls) == 2 and current["rows"] == 500
+    assert os.path.exists(os.path.join(calls[1], "index.json"))
+
+
+def test_attach_gives_up_when_the_file_keeps_changing(csv_path, tmp_path, monkeypatch):
+    def always_pruned(target):
+        raise FileNotFoundError(target)
+
+    monkeypatch.setattr(shared, "read_index", always_pruned)
+    with pytest.raises(RuntimeError):
+        shared.attach_dataset(csv_path, str(tmp_path / "shared"))
+
+
+def test_prune_keeps_other_datasets(csv_path, tmp_path):
+    shared_dir = str(tmp_path / "shared")
+    other = tmp_path / "other.csv"
+    other.write_bytes(b"".join(LINES[:101]))
+    shared.publish_dataset(str(other), shared_dir)
+    for rows in (501, 601, 701):
+        with open(csv_path, "wb") as fh:
+            fh.write(b"".join(LINES[:rows]))
+        os.utime(csv_path, ns=(rows * 10**9, rows * 10**9))
+        shared.publish_dataset(csv_path, shared_dir)
+    names = [n for n in os.listdir(shared_dir) if not n.startswith(".")]
+    assert sum(n.startswith(shared.dataset_key(csv_path)) for n in names) == 2
+    assert sum(n.startswith(shared.dataset_key(str(other))) for n in names) == 1